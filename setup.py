@@ -41,7 +41,6 @@ ext_modules = [
         "pynetim.diffusion_model.independent_cascade_model",
         [
             os.path.join(bindings_dir, "diffusion_model", "ic_bind.cpp"),
-            os.path.join(bindings_dir, "graph", "graph_bind.cpp"),
         ],
         include_dirs=[bindings_dir, include_dir],
         cxx_std=17,
@@ -51,7 +50,6 @@ ext_modules = [
         "pynetim.diffusion_model.linear_threshold_model",
         [
             os.path.join(bindings_dir, "diffusion_model", "lt_bind.cpp"),
-            os.path.join(bindings_dir, "graph", "graph_bind.cpp"),
         ],
         include_dirs=[bindings_dir, include_dir],
         cxx_std=17,
@@ -61,7 +59,6 @@ ext_modules = [
         "pynetim.diffusion_model.susceptible_infected_model",
         [
             os.path.join(bindings_dir, "diffusion_model", "si_bind.cpp"),
-            os.path.join(bindings_dir, "graph", "graph_bind.cpp"),
         ],
         include_dirs=[bindings_dir, include_dir],
         cxx_std=17,
@@ -71,7 +68,6 @@ ext_modules = [
         "pynetim.diffusion_model.susceptible_infected_recovered_model",
         [
             os.path.join(bindings_dir, "diffusion_model", "sir_bind.cpp"),
-            os.path.join(bindings_dir, "graph", "graph_bind.cpp"),
         ],
         include_dirs=[bindings_dir, include_dir],
         cxx_std=17,
@@ -81,7 +77,6 @@ ext_modules = [
         "pynetim.diffusion_model.py_diffusion_model_base",
         [
             os.path.join(bindings_dir, "diffusion_model", "py_diffusion_model_bind.cpp"),
-            os.path.join(bindings_dir, "graph", "graph_bind.cpp"),
         ],
         include_dirs=[bindings_dir, include_dir],
         cxx_std=17,
@@ -0,0 +1,16 @@
+"""
+可选的Numba JIT支持。
+
+安装numba时导出其 njit；否则 NUMBA_AVAILABLE 为 False，njit 退化为不做任何处理的装饰器，
+调用方应据此回退到纯Python实现。
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
@@ -112,8 +112,7 @@ class PageRankAlgorithm(BaseAlgorithm):
             if diff < self.tol:
                 break
         
-        ranked = sorted(pr.items(), key=lambda x: x[1], reverse=True)
-        seeds = {v for v, _ in ranked[:k]}
+        seeds = set(heapq.nlargest(k, pr, key=pr.__getitem__))
         self.seeds = seeds
         return seeds
 
@@ -340,8 +339,7 @@ class BetweennessCentralityAlgorithm(BaseAlgorithm):
             for v in betweenness:
                 betweenness[v] *= scale
         
-        ranked = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)
-        seeds = {v for v, _ in ranked[:k]}
+        seeds = set(heapq.nlargest(k, betweenness, key=betweenness.__getitem__))
         self.seeds = seeds
         return seeds
 
@@ -409,8 +407,7 @@ class ClosenessCentralityAlgorithm(BaseAlgorithm):
             else:
                 closeness[v] = 0.0
         
-        ranked = sorted(closeness.items(), key=lambda x: x[1], reverse=True)
-        seeds = {v for v, _ in ranked[:k]}
+        seeds = set(heapq.nlargest(k, closeness, key=closeness.__getitem__))
         self.seeds = seeds
         return seeds
 
@@ -480,8 +477,7 @@ class EigenvectorCentralityAlgorithm(BaseAlgorithm):
             if diff < self.tol:
                 break
         
-        ranked = sorted(x.items(), key=lambda item: item[1], reverse=True)
-        seeds = {v for v, _ in ranked[:k]}
+        seeds = set(heapq.nlargest(k, x, key=x.__getitem__))
         self.seeds = seeds
         return seeds
 
@@ -7,6 +7,9 @@ namespace py = pybind11;
 PYBIND11_MODULE(linear_threshold_model, m) {
     m.doc() = "线性阈值模型（LT），用于社交网络影响力传播模拟";
 
+    // IMGraph 类型由 pynetim.graph.graph 模块统一注册，本模块不再重复编译图绑定
+    py::module_::import("pynetim.graph.graph");
+
     {
         py::options options;
         options.disable_function_signatures();
@@ -110,6 +113,8 @@ Returns:
                     }
                     bool use_random_seed = random_seed_obj.is_none();
                     unsigned int random_seed = use_random_seed ? 0 : py::cast<unsigned int>(random_seed_obj);
+                    // 模拟过程不访问Python对象，释放GIL使其他Python线程可并行执行
+                    py::gil_scoped_release release;
                     return self.run_monte_carlo_diffusion(mc_rounds, use_random_seed, random_seed, use_multithread, num_threads, normalize);
                 },
                 py::arg("mc_rounds"),
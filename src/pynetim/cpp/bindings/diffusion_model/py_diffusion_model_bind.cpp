@@ -61,6 +61,9 @@ public:
 PYBIND11_MODULE(py_diffusion_model_base, m) {
     m.doc() = "Python 兼容的传播模型基类，用于自定义传播逻辑";
 
+    // IMGraph 类型由 pynetim.graph.graph 模块统一注册，本模块不再重复编译图绑定
+    py::module_::import("pynetim.graph.graph");
+
     {
         py::options options;
         options.disable_function_signatures();
@@ -1,4 +1,5 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
 #include <pybind11/operators.h>
 
@@ -6,6 +7,52 @@
 
 namespace py = pybind11;
 
+namespace {
+
+// 将节点编号数组转换为连续的 int32 数组。
+// 不直接用 forcecast：int64 等更宽的编号会被静默截断，这里先按 int64 检查范围再转换。
+py::array_t<int, py::array::c_style> as_node_array(const py::array& a, int num_nodes,
+                                                   const char* func, const char* name) {
+    if (a.ndim() != 1) {
+        throw py::value_error(std::string(func) + "() 参数错误: " + name + " 必须是一维数组");
+    }
+    char kind = a.dtype().kind();
+    if (kind != 'i' && kind != 'u') {
+        throw py::type_error(std::string(func) + "() 参数错误: " + name + " 必须是整数数组");
+    }
+    if (a.dtype().is(py::dtype::of<int>())) {
+        return py::array_t<int, py::array::c_style | py::array::forcecast>::ensure(a);
+    }
+    auto wide = py::array_t<int64_t, py::array::c_style | py::array::forcecast>::ensure(a);
+    const int64_t* src = wide.data();
+    py::array_t<int, py::array::c_style> out(wide.size());
+    int* dst = out.mutable_data();
+    for (py::ssize_t i = 0; i < wide.size(); ++i) {
+        if (src[i] < 0 || src[i] >= num_nodes) {
+            std::ostringstream oss;
+            oss << func << "() 参数错误: " << name << " 中的节点编号 " << src[i]
+                << " 超出范围 [0, " << num_nodes << ")";
+            throw py::index_error(oss.str());
+        }
+        dst[i] = static_cast<int>(src[i]);
+    }
+    return out;
+}
+
+// 将边权重数组转换为连续的 float64 数组，只接受实数类型
+py::array_t<double, py::array::c_style> as_weight_array(const py::array& a, const char* func) {
+    if (a.ndim() != 1) {
+        throw py::value_error(std::string(func) + "() 参数错误: ws 必须是一维数组");
+    }
+    char kind = a.dtype().kind();
+    if (kind != 'f' && kind != 'i' && kind != 'u') {
+        throw py::type_error(std::string(func) + "() 参数错误: ws 必须是实数数组");
+    }
+    return py::array_t<double, py::array::c_style | py::array::forcecast>::ensure(a);
+}
+
+}  // namespace
+
 PYBIND11_MODULE(graph, m) {
     m.doc() = "图结构模块，提供高效的 C++ 图实现";
 
@@ -125,6 +172,77 @@ Args:
     weights: 边权重列表。
 )doc")
 
+            .def("add_edges_with_weights",
+                [](pynetim::Graph& g, py::array us_obj, py::array vs_obj, py::array ws_obj) {
+                    auto us = as_node_array(us_obj, g.num_nodes, "add_edges_with_weights", "us");
+                    auto vs = as_node_array(vs_obj, g.num_nodes, "add_edges_with_weights", "vs");
+                    auto ws = as_weight_array(ws_obj, "add_edges_with_weights");
+                    if (us.size() != vs.size() || us.size() != ws.size()) {
+                        throw py::value_error("add_edges_with_weights() 参数错误: us, vs, ws 长度必须一致");
+                    }
+                    const int* u = us.data();
+                    const int* v = vs.data();
+                    const double* w = ws.data();
+                    size_t count = static_cast<size_t>(us.size());
+                    // 循环完全在 C++ 中执行，期间释放 GIL
+                    py::gil_scoped_release release;
+                    g.add_edges_with_weights(u, v, w, count);
+                },
+                py::arg("us"), py::arg("vs"), py::arg("ws"),
+                R"doc(add_edges_with_weights(us: numpy.ndarray, vs: numpy.ndarray, ws: numpy.ndarray) -> None
+
+以数组形式批量添加带权边。
+
+第 i 条边为 (us[i], vs[i])，权重为 ws[i]。节点必须是已有的内部编号。
+整个添加过程在 C++ 中完成并释放 GIL，调用期间不要在其他线程中访问该图。
+
+Args:
+    us: 源节点数组，任意整数类型，转换为 int32。
+    vs: 目标节点数组，任意整数类型，转换为 int32。
+    ws: 边权重数组，实数类型，转换为 float64。
+
+Raises:
+    TypeError: 节点数组不是整数类型或权重数组不是实数类型时抛出。
+    ValueError: 数组不是一维或长度不一致时抛出。
+    IndexError: 节点编号超出范围时抛出。
+)doc")
+
+            .def("update_edge_weights",
+                [](pynetim::Graph& g, py::array us_obj, py::array vs_obj, py::array ws_obj) {
+                    auto us = as_node_array(us_obj, g.num_nodes, "update_edge_weights", "us");
+                    auto vs = as_node_array(vs_obj, g.num_nodes, "update_edge_weights", "vs");
+                    auto ws = as_weight_array(ws_obj, "update_edge_weights");
+                    if (us.size() != vs.size() || us.size() != ws.size()) {
+                        throw py::value_error("update_edge_weights() 参数错误: us, vs, ws 长度必须一致");
+                    }
+                    const int* u = us.data();
+                    const int* v = vs.data();
+                    const double* w = ws.data();
+                    size_t count = static_cast<size_t>(us.size());
+                    py::gil_scoped_release release;
+                    g.update_edge_weights(u, v, w, count);
+                },
+                py::arg("us"), py::arg("vs"), py::arg("ws"),
+                R"doc(update_edge_weights(us: numpy.ndarray, vs: numpy.ndarray, ws: numpy.ndarray) -> None
+
+以数组形式批量更新已有边的权重。
+
+第 i 条边 (us[i], vs[i]) 的权重更新为 ws[i]，不会添加新边。先校验全部边，
+任一条边不存在时抛出异常且不修改任何权重。与 update_edge_weight 相同，
+只更新 (u, v) 方向。整个过程在 C++ 中完成并释放 GIL，调用期间不要在其他线程中访问该图。
+
+Args:
+    us: 源节点数组，任意整数类型，转换为 int32。
+    vs: 目标节点数组，任意整数类型，转换为 int32。
+    ws: 边权重数组，实数类型，转换为 float64。
+
+Raises:
+    TypeError: 节点数组不是整数类型或权重数组不是实数类型时抛出。
+    ValueError: 数组不是一维或长度不一致时抛出。
+    IndexError: 节点编号超出范围时抛出。
+    RuntimeError: 边不存在时抛出。
+)doc")
+
             .def("update_edge_weight", &pynetim::Graph::update_edge_weight,
                 py::arg("u"), py::arg("v"), py::arg("w"),
                 R"doc(update_edge_weight(u: int, v: int, w: float) -> None
@@ -400,6 +518,32 @@ Returns:
     List[Tuple[int, int, float]]: (u, v, 权重) 元组列表。
 )doc")
 
+            .def("get_edge_arrays",
+                [](const pynetim::Graph& g) {
+                    py::ssize_t count = static_cast<py::ssize_t>(g.edges.size());
+                    py::array_t<int> us(count);
+                    py::array_t<int> vs(count);
+                    py::array_t<double> ws(count);
+                    int* u = us.mutable_data();
+                    int* v = vs.mutable_data();
+                    double* w = ws.mutable_data();
+                    {
+                        py::gil_scoped_release release;
+                        g.get_edge_arrays(u, v, w);
+                    }
+                    return py::make_tuple(us, vs, ws);
+                },
+                R"doc(get_edge_arrays() -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+以数组形式一次性导出所有边及权重。
+
+顺序与 edges 属性的遍历顺序一致，无向图的每条边按两个方向各导出一次。
+可与 update_edge_weights 配合，在数组上计算新权重后整体写回。
+
+Returns:
+    Tuple[np.ndarray, np.ndarray, np.ndarray]: 源节点数组(int32)、目标节点数组(int32)、边权重数组(float64)。
+)doc")
+
             .def("get_edge_weight", &pynetim::Graph::get_edge_weight,
                 py::arg("u"), py::arg("v"),
                 R"doc(get_edge_weight(u: int, v: int) -> float
@@ -219,6 +219,20 @@ public:
         }
     }
 
+    void add_edges_with_weights(const int* us, const int* vs, const double* ws, size_t count) {
+        // 先整体校验节点编号，避免中途失败时只添加了部分边
+        for (size_t i = 0; i < count; ++i) {
+            if (us[i] < 0 || us[i] >= num_nodes || vs[i] < 0 || vs[i] >= num_nodes) {
+                std::ostringstream oss;
+                oss << "Edge (" << us[i] << ", " << vs[i] << ") has a node out of range [0, " << num_nodes << ")";
+                throw std::out_of_range(oss.str());
+            }
+        }
+        for (size_t i = 0; i < count; ++i) {
+            add_edge(us[i], vs[i], ws[i]);
+        }
+    }
+
     void update_edge_weight(int u, int v, double w) {
         auto it = edges.find({ u, v });
         if (it == edges.end()) {
@@ -235,6 +249,41 @@ public:
         }
     }
 
+    void update_edge_weights(const int* us, const int* vs, const double* ws, size_t count) {
+        // 先整体校验，任一条边不存在时不修改任何权重
+        std::vector<std::unordered_map<std::pair<int, int>, double, EdgeHash>::iterator> targets;
+        targets.reserve(count);
+        for (size_t i = 0; i < count; ++i) {
+            if (us[i] < 0 || us[i] >= num_nodes || vs[i] < 0 || vs[i] >= num_nodes) {
+                std::ostringstream oss;
+                oss << "Edge (" << us[i] << ", " << vs[i] << ") has a node out of range [0, " << num_nodes << ")";
+                throw std::out_of_range(oss.str());
+            }
+            auto it = edges.find({ us[i], vs[i] });
+            if (it == edges.end()) {
+                std::ostringstream oss;
+                oss << "Edge (" << us[i] << ", " << vs[i] << ") does not exist";
+                throw std::runtime_error(oss.str());
+            }
+            targets.push_back(it);
+        }
+
+        std::vector<char> touched(num_nodes, 0);
+        for (size_t i = 0; i < count; ++i) {
+            targets[i]->second = ws[i];
+            touched[us[i]] = 1;
+        }
+        // 每个涉及的源节点只遍历一次邻接表，从 edges 同步权重，避免逐边线性查找
+        for (int u = 0; u < num_nodes; ++u) {
+            if (!touched[u]) {
+                continue;
+            }
+            for (auto& edge : adj[u]) {
+                edge.weight = edges.find({ u, edge.to })->second;
+            }
+        }
+    }
+
     void remove_edge(int u, int v) {
         auto it = edges.find({ u, v });
         if (it == edges.end()) {
@@ -469,6 +518,17 @@ public:
         return sparse_matrix;
     }
 
+    void get_edge_arrays(int* us, int* vs, double* ws) const {
+        // 按 edges 的遍历顺序导出，与 Python 侧读取 edges 属性得到的顺序一致
+        size_t i = 0;
+        for (const auto& item : edges) {
+            us[i] = item.first.first;
+            vs[i] = item.first.second;
+            ws[i] = item.second;
+            ++i;
+        }
+    }
+
     double get_edge_weight(int u, int v) const {
         auto it = edges.find({ u, v });
         if (it == edges.end()) {
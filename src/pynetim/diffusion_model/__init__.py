@@ -5,6 +5,7 @@ from .susceptible_infected_recovered_model import SusceptibleInfectedRecoveredMo
 from .py_diffusion_model_base import PyDiffusionModelBase
 from .base_callback_diffusion_model import BaseCallbackDiffusionModel
 from .base_multiprocess_diffusion_model import BaseMultiprocessDiffusionModel
+from .threaded_diffusion import run_monte_carlo_diffusion_threaded
 
 __all__ = [
     'IndependentCascadeModel',
@@ -14,4 +15,5 @@ __all__ = [
     'PyDiffusionModelBase',
     'BaseCallbackDiffusionModel',
     'BaseMultiprocessDiffusionModel',
+    'run_monte_carlo_diffusion_threaded',
 ]
@@ -0,0 +1,63 @@
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_monte_carlo_diffusion_threaded(
+    model,
+    mc_rounds: int,
+    random_seed: int = None,
+    num_threads: int = None,
+    normalize: bool = False
+) -> float:
+    """在 Python 线程池中并行运行 C++ 传播模型的蒙特卡洛模拟。
+
+    模拟次数被划分给多个线程，每个线程以不同的子种子调用模型的
+    run_monte_carlo_diffusion。C++ 模拟期间会释放 GIL，因此各线程可真正并行执行，
+    最后按各线程的模拟次数加权合并平均影响力。
+
+    Args:
+        model: C++ 传播模型对象，如 IndependentCascadeModel、LinearThresholdModel 等。
+        mc_rounds: 蒙特卡洛模拟次数。
+        random_seed: 随机数种子，用于派生各线程的子种子，默认为 None（每次结果不同）。
+        num_threads: 线程数，默认使用 CPU 核心数。
+        normalize: 是否将结果归一化（除以图节点数），默认为 False。
+
+    Returns:
+        float: 平均激活节点数。若 normalize=True，返回归一化后的影响力比例。
+
+    Raises:
+        ValueError: 当 mc_rounds <= 0 或 num_threads <= 0 时抛出。
+
+    Note:
+        各线程共享同一个模型对象，开启 record_activated 或 record_activation_frequency
+        时记录结果会被并发写入。需要记录时请改用 run_monte_carlo_diffusion(use_multithread=True)。
+
+    Example:
+        >>> from pynetim import IMGraph, IndependentCascadeModel
+        >>> from pynetim.diffusion_model import run_monte_carlo_diffusion_threaded
+        >>> graph = IMGraph([(0, 1), (1, 2)], weights=0.5)
+        >>> model = IndependentCascadeModel(graph, {0})
+        >>> avg = run_monte_carlo_diffusion_threaded(model, 1000, random_seed=42)
+    """
+    if mc_rounds <= 0:
+        raise ValueError("模拟次数(mc_rounds)必须大于0")
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    if num_threads <= 0:
+        raise ValueError("线程数(num_threads)必须大于0")
+
+    num_threads = min(num_threads, mc_rounds)
+    base, extra = divmod(mc_rounds, num_threads)
+    chunk_rounds = [base + (1 if i < extra else 0) for i in range(num_threads)]
+
+    seed_rng = random.Random(random_seed)
+    chunk_seeds = [seed_rng.getrandbits(32) for _ in range(num_threads)]
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = list(executor.map(
+            lambda args: model.run_monte_carlo_diffusion(args[0], args[1], normalize=normalize),
+            zip(chunk_rounds, chunk_seeds)
+        ))
+
+    return sum(avg * rounds for avg, rounds in zip(results, chunk_rounds)) / mc_rounds
@@ -0,0 +1,34 @@
+"""
+边权重计算内核。
+
+安装numba时内核在首次调用时按实际参数类型编译，以 nogil 模式运行，可与线程池并行使用；
+未安装时 NUMBA_AVAILABLE 为 False，内核改用等价的NumPy实现。
+"""
+import numpy as np
+
+from .._jit import NUMBA_AVAILABLE, njit
+
+
+@njit(nogil=True, cache=True)
+def _wc_weights_numba(targets, in_degrees, out):
+    for i in range(targets.shape[0]):
+        out[i] = 1.0 / in_degrees[targets[i]]
+
+
+def _wc_weights_numpy(targets, in_degrees, out):
+    np.reciprocal(in_degrees[targets], out=out)
+
+
+def wc_weights(targets: np.ndarray, in_degrees: np.ndarray, out: np.ndarray) -> None:
+    """
+    WC模型：每条边的权重为目标节点入度的倒数。
+
+    Args:
+        targets (np.ndarray): 每条边的目标节点编号，int32
+        in_degrees (np.ndarray): 按节点编号的入度，float64
+        out (np.ndarray): 与targets对齐的输出权重，float64，原地写入
+    """
+    if NUMBA_AVAILABLE:
+        _wc_weights_numba(targets, in_degrees, out)
+    else:
+        _wc_weights_numpy(targets, in_degrees, out)
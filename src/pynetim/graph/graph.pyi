@@ -1,4 +1,5 @@
 from typing import List, Tuple, Dict, Set, Union, TYPE_CHECKING
+import numpy as np
 
 if TYPE_CHECKING:
     pass
@@ -71,6 +72,44 @@ class IMGraph:
         """
         ...
     
+    def add_edges_with_weights(self, us: np.ndarray, vs: np.ndarray, ws: np.ndarray) -> None:
+        """以数组形式批量添加带权边。
+        
+        第 i 条边为 (us[i], vs[i])，权重为 ws[i]。节点必须是已有的内部编号。
+        整个添加过程在 C++ 中完成并释放 GIL，调用期间不要在其他线程中访问该图。
+        
+        Args:
+            us: 源节点数组，任意整数类型，转换为 int32。
+            vs: 目标节点数组，任意整数类型，转换为 int32。
+            ws: 边权重数组，实数类型，转换为 float64。
+        
+        Raises:
+            TypeError: 节点数组不是整数类型或权重数组不是实数类型时抛出。
+            ValueError: 数组不是一维或长度不一致时抛出。
+            IndexError: 节点编号超出范围时抛出。
+        """
+        ...
+    
+    def update_edge_weights(self, us: np.ndarray, vs: np.ndarray, ws: np.ndarray) -> None:
+        """以数组形式批量更新已有边的权重。
+        
+        第 i 条边 (us[i], vs[i]) 的权重更新为 ws[i]，不会添加新边。先校验全部边，
+        任一条边不存在时抛出异常且不修改任何权重。与 update_edge_weight 相同，
+        只更新 (u, v) 方向。整个过程在 C++ 中完成并释放 GIL，调用期间不要在其他线程中访问该图。
+        
+        Args:
+            us: 源节点数组，任意整数类型，转换为 int32。
+            vs: 目标节点数组，任意整数类型，转换为 int32。
+            ws: 边权重数组，实数类型，转换为 float64。
+        
+        Raises:
+            TypeError: 节点数组不是整数类型或权重数组不是实数类型时抛出。
+            ValueError: 数组不是一维或长度不一致时抛出。
+            IndexError: 节点编号超出范围时抛出。
+            RuntimeError: 边不存在时抛出。
+        """
+        ...
+    
     def update_edge_weight(self, u: int, v: int, w: float) -> None:
         """更新已有边的权重。
         
@@ -302,6 +341,17 @@ class IMGraph:
         """
         ...
     
+    def get_edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """以数组形式一次性导出所有边及权重。
+        
+        顺序与 edges 属性的遍历顺序一致，无向图的每条边按两个方向各导出一次。
+        可与 update_edge_weights 配合，在数组上计算新权重后整体写回。
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: 源节点数组(int32)、目标节点数组(int32)、边权重数组(float64)。
+        """
+        ...
+    
     def get_edge_weight(self, u: int, v: int) -> float:
         """获取边的权重。若边不存在则抛出异常。
         
@@ -1,6 +1,10 @@
 import random
 from typing import Dict, List, Literal, Tuple, TYPE_CHECKING
 
+import numpy as np
+
+from ._weight_kernels import wc_weights
+
 if TYPE_CHECKING:
     from .graph import IMGraph
 
@@ -74,8 +78,9 @@ def set_const_weights(graph: "IMGraph", value: float) -> None:
     if not 0 < value <= 1:
         raise ValueError(f"权重值必须在 (0, 1] 范围内，当前值: {value}")
 
-    for (u, v) in graph.edges.keys():
-        graph.update_edge_weight(u, v, value)
+    sources, targets, weights = graph.get_edge_arrays()
+    weights.fill(value)
+    graph.update_edge_weights(sources, targets, weights)
 
 
 def set_tv_weights(graph: "IMGraph", values: List[float]) -> None:
@@ -100,9 +105,11 @@ def set_tv_weights(graph: "IMGraph", values: List[float]) -> None:
         if not 0 < v <= 1:
             raise ValueError(f"权重值必须在 (0, 1] 范围内，当前值: {v}")
 
-    for (u, v) in graph.edges.keys():
-        weight = random.choice(values)
-        graph.update_edge_weight(u, v, weight)
+    sources, targets, _ = graph.get_edge_arrays()
+    # 等概率抽取候选值下标后查表；生成器的种子取自random模块，random.seed 仍可控制结果
+    rng = np.random.default_rng(random.getrandbits(64))
+    weights = np.asarray(values, dtype=np.float64)[rng.integers(0, len(values), size=len(sources))]
+    graph.update_edge_weights(sources, targets, weights)
 
 
 def set_uniform_weights(graph: "IMGraph", low: float, high: float) -> None:
@@ -128,9 +135,11 @@ def set_uniform_weights(graph: "IMGraph", low: float, high: float) -> None:
     if low >= high:
         raise ValueError(f"下界 ({low}) 必须小于上界 ({high})")
 
-    for (u, v) in graph.edges.keys():
-        weight = random.uniform(low, high)
-        graph.update_edge_weight(u, v, weight)
+    sources, targets, _ = graph.get_edge_arrays()
+    # 生成器的种子取自random模块，random.seed 仍可控制结果
+    rng = np.random.default_rng(random.getrandbits(64))
+    weights = rng.uniform(low, high, size=len(sources))
+    graph.update_edge_weights(sources, targets, weights)
 
 
 def set_wc_weights(graph: "IMGraph") -> None:
@@ -146,12 +155,13 @@ def set_wc_weights(graph: "IMGraph") -> None:
         >>> g = generate_er_graph(n=100, p=0.1)
         >>> set_wc_weights(g)
     """
-    in_degrees = graph.get_all_in_degrees()
+    # 边数组一次性取出，权重在数组上计算后整体写回，不再逐边调用 update_edge_weight
+    sources, targets, weights = graph.get_edge_arrays()
+    in_degrees = np.asarray(graph.get_all_in_degrees(), dtype=np.float64)
 
-    for (u, v) in graph.edges.keys():
-        in_deg = in_degrees[v]
-        weight = 1.0 / in_deg
-        graph.update_edge_weight(u, v, weight)
+    wc_weights(targets, in_degrees, weights)
+
+    graph.update_edge_weights(sources, targets, weights)
 
 
 def set_edge_weights_dict(
@@ -0,0 +1,6 @@
+"""
+可选的Numba JIT支持，实现位于 pynetim._jit，C++主模块与本模块共用。
+"""
+from .._jit import NUMBA_AVAILABLE, njit
+
+__all__ = ['NUMBA_AVAILABLE', 'njit']
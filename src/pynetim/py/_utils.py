@@ -1,34 +1,101 @@
 import random
+from functools import singledispatch
 from typing import Union
+
+import numpy as np
 from networkx import Graph, DiGraph
 
+# TV模型的候选边权重
+_TV_WEIGHTS = np.array([0.001, 0.01, 0.1])
+
+
+def _set_constant_weights(graph: Union[Graph, DiGraph], constant_weight: float):
+    if constant_weight is None:
+        raise ValueError('使用CONSTANT模型时必须提供常量权重值')
+    # 直接遍历邻接字典；无向图的两个方向共用同一个属性字典，重复赋值无影响
+    for nbrs in graph._adj.values():
+        for data in nbrs.values():
+            data['weight'] = constant_weight
+
+
+def _sample_tv_weights(graph: Union[Graph, DiGraph]):
+    # 一次性为所有边抽取候选值下标再查表，省去choice的累积概率查找；
+    # 生成器的种子取自random模块，random.seed 仍可控制结果
+    rng = np.random.default_rng(random.getrandbits(64))
+    idx = rng.integers(0, len(_TV_WEIGHTS), size=graph.number_of_edges(), dtype=np.uint8)
+    return iter(_TV_WEIGHTS[idx].tolist())
+
+
+def _inv_degree(graph: Union[Graph, DiGraph], degree) -> dict:
+    # 一次性取出所有节点的（入）度并求倒数，边循环中只做字典查找
+    degrees = np.fromiter((d for _, d in degree), dtype=np.float64, count=graph.number_of_nodes())
+    with np.errstate(divide='ignore'):
+        return dict(zip(graph.nodes, np.reciprocal(degrees, out=degrees).tolist()))
+
+
+# TV与WC的设置函数按图类型分派：默认实现处理无向图，有向图单独注册，
+# 函数体内不再判断图的方向
+@singledispatch
+def _set_tv_weights(graph: Graph, constant_weight: float = None):
+    weights = _sample_tv_weights(graph)
+    # 无向图每条边在邻接字典中出现两次，按 graph.edges() 的顺序只取第一次
+    seen = set()
+    for u, nbrs in graph._adj.items():
+        for v, data in nbrs.items():
+            if v not in seen:
+                data['weight'] = next(weights)
+        seen.add(u)
+
+
+@_set_tv_weights.register(DiGraph)
+def _set_tv_weights_directed(graph: DiGraph, constant_weight: float = None):
+    weights = _sample_tv_weights(graph)
+    for nbrs in graph._succ.values():
+        for data in nbrs.values():
+            data['weight'] = next(weights)
+
+
+@singledispatch
+def _set_wc_weights(graph: Graph, constant_weight: float = None):
+    inv_degree = _inv_degree(graph, graph.degree)
+    # 无向图按 graph.edges() 的顺序确定每条边的目标节点，与逐边遍历EdgeView的结果一致
+    seen = set()
+    for u, nbrs in graph._adj.items():
+        for v, data in nbrs.items():
+            if v not in seen:
+                data['weight'] = inv_degree[v]
+        seen.add(u)
+
+
+@_set_wc_weights.register(DiGraph)
+def _set_wc_weights_directed(graph: DiGraph, constant_weight: float = None):
+    inv_degree = _inv_degree(graph, graph.in_degree)
+    for nbrs in graph._succ.values():
+        for v, data in nbrs.items():
+            data['weight'] = inv_degree[v]
+
+
+# 边权重类型到对应设置函数的映射，类型判断只在入口处做一次
+_EDGE_WEIGHT_SETTERS = {
+    'CONSTANT': _set_constant_weights,
+    'TV': _set_tv_weights,
+    'WC': _set_wc_weights,
+}
+
 
 def set_edge_weight(graph: Union[Graph, DiGraph], edge_weight_type: str, constant_weight: float = None):
-    edge_weight_type = edge_weight_type.upper()
-    
-    if edge_weight_type == 'CONSTANT':
-        if constant_weight is None:
-            raise ValueError('使用CONSTANT模型时必须提供常量权重值')
-        for u, v in graph.edges():
-            graph.edges[(u, v)]['weight'] = constant_weight
-    elif edge_weight_type == 'TV':
-        weight_list = [0.001, 0.01, 0.1]
-        for u, v in graph.edges():
-            graph.edges[(u, v)]['weight'] = random.choice(weight_list)
-    elif edge_weight_type == 'WC':
-        for u, v in graph.edges():
-            if graph.is_directed():
-                graph.edges[(u, v)]['weight'] = 1 / graph.in_degree(v)
-            else:
-                graph.edges[(u, v)]['weight'] = 1 / graph.degree(v)
-    else:
+    setter = _EDGE_WEIGHT_SETTERS.get(edge_weight_type.upper())
+    if setter is None:
         raise ValueError('不支持的边权重模型')
+    setter(graph, constant_weight)
 
 
 def infection_threshold(graph: Union[Graph, DiGraph]) -> float:
-    degree_dict = dict(graph.degree())
-    degrees = list(degree_dict.values())
-    k = sum(degrees)
-    k2 = sum(x ** 2 for x in degrees)
+    # 一次遍历同时累加度之和与度的平方和
+    k = 0
+    k2 = 0
+    for _, d in graph.degree():
+        k += d
+        k2 += d * d
     beta = k / (k2 - k)
     return beta + 0.05 * beta
@@ -1,16 +1,52 @@
+import copy
+import heapq
 import math
 import random
 import logging
-from typing import List, Set, Dict, Callable, Tuple
+from typing import List, Set, Callable, Tuple
 from multiprocessing import Pool, cpu_count
 
+import numpy as np
+
 from ..graph import IMGraphPy
 from .base_algorithm import BaseAlgorithm
+from ._ris_kernels import NUMBA_AVAILABLE, seed_kernels, sample_rr_ic, sample_rr_lt, greedy_select
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 多进程模式下每个进程平均分到的任务批次数，批次越多负载越均衡
+_BATCHES_PER_PROCESS = 4
+
+# 工作进程中的算法实例（不含图对象），由进程池的initializer在进程启动时设置一次
+_WORKER_ALGORITHM = None
+
+
+def _worker_init(algorithm: "BaseRISAlgorithm"):
+    """
+    多进程RR集合生成的进程初始化函数。
+
+    Args:
+        algorithm (BaseRISAlgorithm): 由 _worker_copy 得到的算法实例
+    """
+    global _WORKER_ALGORITHM
+    _WORKER_ALGORITHM = algorithm
+
+
+def _rr_worker(task: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    多进程RR集合生成的任务函数。
+
+    Args:
+        task (Tuple[int, int]): (本批RR集合数量, 本批随机种子)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 本批RR集合拼接后的节点编号数组和各RR集合长度
+    """
+    num_rr_sets, sub_seed = task
+    return _WORKER_ALGORITHM._generate_rr_sets_single_process(num_rr_sets, sub_seed)
+
 
 class BaseRISAlgorithm(BaseAlgorithm):
     """
@@ -32,6 +68,10 @@ class BaseRISAlgorithm(BaseAlgorithm):
         graph (IMGraph): 输入图对象
         model (str): 扩散模型名称('IC'或'LT')
         nodes (list): 图中所有节点的列表
+        node_index (dict): 节点到连续整数编号的映射
+        rev_indptr (np.ndarray): 反向CSR的行指针，即图的in_indptr
+        rev_indices (np.ndarray): 反向CSR的列索引（入邻居编号），即图的in_indices
+        rev_w (np.ndarray): 与rev_indices对齐的边权重，即图的in_weights
         rr_func (Callable): 用于生成RR集合的函数
         multi_process (bool): 是否启用多进程模式
         processes (int): 多进程模式下的进程数
@@ -53,7 +93,15 @@ class BaseRISAlgorithm(BaseAlgorithm):
         super(BaseRISAlgorithm, self).__init__(graph, diffusion_model)
         self.graph = graph
         self.model = diffusion_model.upper()
-        self.nodes = list(graph.nodes)
+        self.nodes = graph.node_list
+        self.node_index = graph.node_index
+        # 反向采样直接使用图的入边CSR，与扩散模型看到的是同一张图
+        self.rev_indptr, self.rev_indices, self.rev_w = graph.in_indptr, graph.in_indices, graph.in_weights
+        # Numba内核复用的访问标记与队列缓冲区
+        self._visited_buf = np.zeros(len(self.nodes), dtype=np.int8)
+        self._queue_buf = np.empty(len(self.nodes), dtype=np.int32)
+        # 纯Python采样复用的访问标记，每次采样后只复位访问过的位置
+        self._visited_bytes = bytearray(len(self.nodes))
         if self.model == "IC":
             self.rr_func = self._sample_rr_ic
         elif self.model == "LT":
@@ -68,155 +116,275 @@ class BaseRISAlgorithm(BaseAlgorithm):
         self.multi_process = multi_process
 
         self.seed = seed
-        random.seed(self.seed)
+        # 实例独立的随机数生成器，不影响也不依赖全局 random 状态
+        self._rng = random.Random(self.seed)
+        if NUMBA_AVAILABLE and self.seed is not None:
+            seed_kernels(self.seed)
+
+    def _worker_copy(self) -> "BaseRISAlgorithm":
+        """
+        返回供工作进程使用的浅拷贝。
+
+        拷贝不持有图对象，采样只依赖反向CSR数组，因此传给工作进程的数据量与图的大小
+        成线性关系且远小于networkx图本身。
+
+        Returns:
+            BaseRISAlgorithm: 不含图对象的算法实例
+        """
+        worker = copy.copy(self)
+        worker.graph = None
+        # rr_func 绑定在原实例上，需重新绑定到拷贝，否则序列化时会带上原实例的图
+        worker.rr_func = getattr(worker, self.rr_func.__name__)
+        return worker
 
-    def _sample_rr_ic(self, start_node: int) -> Set[int]:
+    def _sample_rr_ic(self, start_node: int) -> np.ndarray:
         """
-        IC模型：从起始节点反向BFS采样可达节点。
+        IC模型：从起始节点沿反向CSR做BFS采样可达节点。
 
         Args:
             start_node (int): 起始节点
 
         Returns:
-            Set[int]: 反向可达节点集合
+            np.ndarray: 反向可达节点的编号数组
         """
-        active = {start_node}
-        queue = [start_node]
-
-        while queue:
-            u = queue.pop(0)
-            for v in self.graph.in_neighbors(u):
-                if v not in active and random.random() <= self.graph.edges[v, u]['weight']:
-                    active.add(v)
+        indptr, indices, weights = self.rev_indptr, self.rev_indices, self.rev_w
+        start = self.node_index[start_node]
+        if NUMBA_AVAILABLE:
+            return sample_rr_ic(start, indptr, indices, weights, self._visited_buf, self._queue_buf)
+
+        rand = self._rng.random
+        visited = self._visited_bytes
+        visited[start] = 1
+        # 以游标推进代替出队，队列本身即为访问过的节点
+        queue = [start]
+        head = 0
+
+        while head < len(queue):
+            u = queue[head]
+            head += 1
+            s, e = indptr[u], indptr[u + 1]
+            for v, w in zip(indices[s:e].tolist(), weights[s:e].tolist()):
+                if not visited[v] and rand() <= w:
+                    visited[v] = 1
                     queue.append(v)
-        return active
 
-    def _sample_rr_lt(self, start_node: int) -> Set[int]:
+        for v in queue:
+            visited[v] = 0
+        return np.asarray(queue, dtype=np.int32)
+
+    def _sample_rr_lt(self, start_node: int) -> np.ndarray:
         """
-        LT模型：从起始节点反向随机走一条路径。
+        LT模型：从起始节点沿反向CSR随机走一条路径。
 
         Args:
             start_node (int): 起始节点
 
         Returns:
-            Set[int]: 反向可达节点集合
+            np.ndarray: 反向可达节点的编号数组
         """
-        active = {start_node}
-        current = start_node
-        nodes = list(self.graph.nodes)
-
-        while current in nodes:
-            in_neighbors = list(self.graph.in_neighbors(current))
-            if not in_neighbors:
+        indptr, indices = self.rev_indptr, self.rev_indices
+        current = self.node_index[start_node]
+        if NUMBA_AVAILABLE:
+            return sample_rr_lt(current, indptr, indices, self._visited_buf, self._queue_buf)
+
+        visited = self._visited_bytes
+        visited[current] = 1
+        path = [current]
+
+        while True:
+            s, e = indptr[current], indptr[current + 1]
+            if s == e:
                 break
             # 随机选择一个前驱（等概率）
-            pred = random.choice(in_neighbors)
-            if pred not in active:
-                active.add(pred)
+            pred = int(indices[self._rng.randrange(s, e)])
+            if not visited[pred]:
+                visited[pred] = 1
+                path.append(pred)
                 current = pred
             else:
                 break  # 遇到已激活节点，停止
-        return active
 
-    def _generate_rr_sets_single_process(self, num_rr_sets: int) -> List[Set[int]]:
+        for v in path:
+            visited[v] = 0
+        return np.asarray(path, dtype=np.int32)
+
+    @staticmethod
+    def _concat_rr_sets(rr_sets: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
         """
-        在单个进程中生成RR集合。
+        将RR集合列表拼接为连续的节点编号数组和长度数组。
+
+        Args:
+            rr_sets (List[np.ndarray]): RR集合列表，每个RR集合为节点编号数组
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 拼接后的节点编号数组(int32)和各RR集合长度(int64)
+        """
+        if not rr_sets:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        rr_len = np.fromiter(map(len, rr_sets), dtype=np.int64, count=len(rr_sets))
+        return np.concatenate(rr_sets).astype(np.int32, copy=False), rr_len
+
+    @staticmethod
+    def _build_rr_csr(data_chunks: List[np.ndarray], len_chunks: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        由若干分块拼接出RR集合的CSR表示。
+
+        第i个RR集合为 rr_data[rr_ptr[i]:rr_ptr[i + 1]]。
+
+        Args:
+            data_chunks (List[np.ndarray]): 各分块的节点编号数组
+            len_chunks (List[np.ndarray]): 各分块的RR集合长度数组
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (rr_data, rr_ptr)
+        """
+        rr_data = np.concatenate(data_chunks).astype(np.int32, copy=False)
+        rr_len = np.concatenate(len_chunks)
+        rr_ptr = np.zeros(len(rr_len) + 1, dtype=np.int64)
+        np.cumsum(rr_len, out=rr_ptr[1:])
+        return rr_data, rr_ptr
+
+    def _sample_rr_sets(self, num_rr_sets: int) -> List[np.ndarray]:
+        """
+        从随机起始节点采样指定数量的RR集合。
 
         Args:
             num_rr_sets (int): 需要生成的RR集合数量
 
         Returns:
-            List[Set[int]]: RR集合列表
+            List[np.ndarray]: RR集合列表，每个RR集合为节点编号数组
         """
-        rr_sets = []
+        # 数量已知，预分配列表后按下标填充
+        rr_sets = [None] * num_rr_sets
         nodes = self.nodes
+        choice, rr_func = self._rng.choice, self.rr_func
         for i in range(num_rr_sets):
-            random.seed(self.seed)
-            v = random.choice(nodes)
-            rr_set = self.rr_func(v)
-            rr_sets.append(rr_set)
+            rr_sets[i] = rr_func(choice(nodes))
         return rr_sets
 
-    def _generate_rr_sets(self, num_rr_sets: int) -> List[Set[int]]:
+    def _generate_rr_sets_single_process(self, num_rr_sets: int, sub_seed: int = None) -> Tuple[np.ndarray, np.ndarray]:
         """
-        生成指定数量的RR集合，支持单进程和多进程模式。
+        在单个进程中生成RR集合。
 
         Args:
             num_rr_sets (int): 需要生成的RR集合数量
+            sub_seed (int, optional): 该进程的随机种子，为None时从系统熵源重新播种
 
         Returns:
-            List[Set[int]]: RR集合列表
+            Tuple[np.ndarray, np.ndarray]: 拼接后的节点编号数组和各RR集合长度
         """
-        if self.multi_process:
-            # 每个进程生成 num_rr_sets / processes 个RR集合
-            rr_sets_per_worker = int(num_rr_sets / self.processes)
-            remaining_rr_sets = num_rr_sets - rr_sets_per_worker * self.processes
+        # 子进程继承了父进程的随机状态，必须在入口处重新播种，否则各进程采样结果相同
+        self._rng.seed(sub_seed)
+        if NUMBA_AVAILABLE:
+            seed_kernels(sub_seed if sub_seed is not None else self._rng.randrange(2 ** 32))
 
-            with Pool(processes=self.processes) as pool:
-                # 为每个进程准备参数
-                args = [(rr_sets_per_worker, ) for _ in range(self.processes)]
-                # 如果有余数，分配给第一个进程处理
-                if remaining_rr_sets > 0 and args:
-                    args[0] = (rr_sets_per_worker + remaining_rr_sets)
+        return self._concat_rr_sets(self._sample_rr_sets(num_rr_sets))
 
-                results = pool.starmap(self._generate_rr_sets_single_process, args)
+    def _generate_rr_sets(self, num_rr_sets: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        生成指定数量的RR集合，支持单进程和多进程模式。
+
+        Args:
+            num_rr_sets (int): 需要生成的RR集合数量
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: RR集合的CSR表示(rr_data, rr_ptr)
+        """
+        if self.multi_process:
+            # 将RR集合切分为若干小批次，按完成顺序流式取回，避免单个进程被大RR集合拖慢
+            num_batches = max(1, min(num_rr_sets, self.processes * _BATCHES_PER_PROCESS))
+            base, remaining_rr_sets = divmod(num_rr_sets, num_batches)
+            # 每个批次使用不同的派生种子，余数分摊到前几个批次
+            tasks = [(base + (1 if i < remaining_rr_sets else 0),
+                      self.seed + i if self.seed is not None else None)
+                     for i in range(num_batches)]
+
+            # 算法实例只在进程启动时传递一次，任务中仅包含批次大小和种子
+            with Pool(processes=self.processes, initializer=_worker_init,
+                      initargs=(self._worker_copy(),)) as pool:
+                results = list(pool.imap_unordered(_rr_worker, tasks))
 
             # 合并所有进程的结果
-            rr_sets = []
-            for result in results:
-                rr_sets.extend(result)
+            rr_data, rr_ptr = self._build_rr_csr([r[0] for r in results], [r[1] for r in results])
 
-            logger.info(f"已生成 {len(rr_sets)} 个RR集合（多进程模式）")
+            logger.info(f"已生成 {len(rr_ptr) - 1} 个RR集合（多进程模式）")
         else:
             # 单进程模式（原始实现）
-            rr_sets = []
-            for _ in range(num_rr_sets):
-                v = random.choice(self.nodes)
-                rr_set = self.rr_func(v)
-                rr_sets.append(rr_set)
-            logger.info(f"已生成 {len(rr_sets)} 个RR集合（单进程模式）")
+            rr_data, rr_len = self._concat_rr_sets(self._sample_rr_sets(num_rr_sets))
+            rr_data, rr_ptr = self._build_rr_csr([rr_data], [rr_len])
+            logger.info(f"已生成 {len(rr_ptr) - 1} 个RR集合（单进程模式）")
 
-        return rr_sets
+        return rr_data, rr_ptr
 
-    def _node_selection(self, rr_sets: List[Set[int]], k: int) -> Tuple[Set[int], float]:
+    def _node_selection(self, rr_data: np.ndarray, rr_ptr: np.ndarray, k: int) -> Tuple[Set[int], float]:
         """
         节点选择算法，返回选出的种子集合和覆盖比例。
 
         Args:
-            rr_sets (List[Set[int]]): RR集合列表
+            rr_data (np.ndarray): 所有RR集合拼接后的节点编号数组
+            rr_ptr (np.ndarray): RR集合的CSR行指针，长度为RR集合数量+1
             k (int): 需要选择的种子节点数量
 
         Returns:
             Tuple[Set[int], float]: 选出的种子节点集合和覆盖比例
         """
-        rr_degree = {node: 0 for node in self.graph.nodes}
-        node_to_rr_idx: Dict[int, List[int]] = {}
-
-        # 统计每个节点出现在多少个RR集合中
-        for rr_idx, rr_set in enumerate(rr_sets):
-            for node in rr_set:
-                rr_degree[node] += 1
-                node_to_rr_idx.setdefault(node, []).append(rr_idx)
-
+        n = len(self.nodes)
+        num_rr_sets = len(rr_ptr) - 1
+
+        # 统计每个节点出现在多少个RR集合中，并按CSR构建 节点 -> RR集合编号 的倒排表
+        degree = np.bincount(rr_data, minlength=n)
+        node_rr_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degree, out=node_rr_ptr[1:])
+        rr_ids = np.repeat(np.arange(num_rr_sets, dtype=np.int32), np.diff(rr_ptr))
+        node_rr_idx = rr_ids[np.argsort(rr_data, kind='stable')]
+
+        if NUMBA_AVAILABLE:
+            seed_idx, matched_count = greedy_select(rr_data, rr_ptr, node_rr_idx, node_rr_ptr, n, k)
+            Sk = {self.nodes[i] for i in seed_idx.tolist()}
+            coverage_ratio = matched_count / num_rr_sets if num_rr_sets else 0.0
+            return Sk, coverage_ratio
+
+        rr_degree = degree.tolist()
+        data, ptr = rr_data.tolist(), rr_ptr.tolist()
+        node_rr_idx, node_rr_ptr = node_rr_idx.tolist(), node_rr_ptr.tolist()
+
+        # 最大堆存储 (-覆盖度, 节点)，度数变化后压入新条目，旧条目出堆时丢弃
+        heap = [(-d, node) for node, d in enumerate(rr_degree) if d > 0]
+        heapq.heapify(heap)
+
+        # 标记已被种子覆盖的RR集合，取代从倒排表中逐个删除
+        rr_covered = bytearray(num_rr_sets)
         Sk = set()
         matched_count = 0
 
         for _ in range(k):
             # 找当前覆盖最多未覆盖RR集合的节点
-            max_node = max(self.graph.nodes, key=lambda x: rr_degree[x])
-            if rr_degree[max_node] == 0:
+            max_node = None
+            while heap:
+                neg_degree, node = heapq.heappop(heap)
+                if -neg_degree == rr_degree[node]:
+                    max_node = node
+                    break
+            if max_node is None or rr_degree[max_node] == 0:
                 break
 
-            Sk.add(max_node)
-            matched_count += len(node_to_rr_idx[max_node])
+            Sk.add(self.nodes[max_node])
 
-            # 删除已被该节点覆盖的RR集合
-            for rr_idx in node_to_rr_idx[max_node]:
-                for node_in_rr in rr_sets[rr_idx]:
+            # 跳过已覆盖的RR集合，新覆盖的RR集合中节点覆盖度减一
+            updated = set()
+            for rr_idx in node_rr_idx[node_rr_ptr[max_node]:node_rr_ptr[max_node + 1]]:
+                if rr_covered[rr_idx]:
+                    continue
+                rr_covered[rr_idx] = 1
+                matched_count += 1
+                for node_in_rr in data[ptr[rr_idx]:ptr[rr_idx + 1]]:
                     rr_degree[node_in_rr] -= 1
-                    node_to_rr_idx[node_in_rr].remove(rr_idx)
+                    updated.add(node_in_rr)
+            for node in updated:
+                if rr_degree[node] > 0:
+                    heapq.heappush(heap, (-rr_degree[node], node))
 
-        coverage_ratio = matched_count / len(rr_sets) if rr_sets else 0.0
+        coverage_ratio = matched_count / num_rr_sets if num_rr_sets else 0.0
         return Sk, coverage_ratio
 
     def run(self, k: int, num_rr_sets: int) -> List[int]:
@@ -236,10 +404,10 @@ class BaseRISAlgorithm(BaseAlgorithm):
         logger.info(f"SimpleRIS: k={k}, num_rr_sets={num_rr_sets}, model={self.model}")
 
         # Step 1: 生成RR集合
-        rr_sets = self._generate_rr_sets(num_rr_sets)
+        rr_data, rr_ptr = self._generate_rr_sets(num_rr_sets)
 
         # 选择节点
-        seeds, _ = self._node_selection(rr_sets, k)
+        seeds, _ = self._node_selection(rr_data, rr_ptr, k)
 
         return list(seeds)
 
@@ -282,7 +450,11 @@ class IMMAlgorithm(BaseRISAlgorithm):
         """
         super(IMMAlgorithm, self).__init__(graph, diffusion_model, multi_process, processes, seed)
         self.eps = eps
-        self.l = l * (1 + math.log(2) / math.log(graph.number_of_nodes))
+        # IMGraphPy.number_of_nodes 是属性而非方法；n < 2 时 log(n) 为0，公式无意义
+        n = len(self.nodes)
+        if n < 2:
+            raise ValueError("IMM算法要求图中至少有2个节点")
+        self.l = l * (1 + math.log(2) / math.log(n))
 
     @staticmethod
     def _log_binomial(n: int, k: int) -> float:
@@ -298,14 +470,9 @@ class IMMAlgorithm(BaseRISAlgorithm):
         """
         if k == 0:
             return 0.0
-        res = 0.0
-        for i in range(n - k + 1, n + 1):
-            res += math.log(i)
-        for i in range(1, k + 1):
-            res -= math.log(i)
-        return res
-
-    def _sampling(self, k: int) -> List[Set[int]]:
+        return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+    def _sampling(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
         """
         IMM采样主过程。
 
@@ -313,10 +480,13 @@ class IMMAlgorithm(BaseRISAlgorithm):
             k (int): 需要选择的种子节点数量
 
         Returns:
-            List[Set[int]]: 采样得到的RR集合列表
+            Tuple[np.ndarray, np.ndarray]: 采样得到的RR集合的CSR表示(rr_data, rr_ptr)
         """
         n = len(self.nodes)
-        R: List[Set[int]] = []
+        # 每批新采样的RR集合拼接成一个分块，选点前再合并为CSR
+        data_chunks: List[np.ndarray] = []
+        len_chunks: List[np.ndarray] = []
+        num_R = 0
         LB = 1.0
 
         eps_p = self.eps * math.sqrt(2)
@@ -330,11 +500,16 @@ class IMMAlgorithm(BaseRISAlgorithm):
             x = n / (2 ** i)
             theta_i = int(lambda_p / x)
 
-            while len(R) < theta_i:
-                v = random.choice(list(self.graph.nodes))
-                R.append(self.rr_func(v))
+            batch = self._sample_rr_sets(max(0, theta_i - num_R))
+            if batch:
+                rr_data, rr_len = self._concat_rr_sets(batch)
+                data_chunks.append(rr_data)
+                len_chunks.append(rr_len)
+                num_R += len(batch)
 
-            _, F = self._node_selection(R, k)
+            if not data_chunks:
+                continue
+            _, F = self._node_selection(*self._build_rr_csr(data_chunks, len_chunks), k)
             if n * F >= (1 + eps_p) * x:
                 LB = n * F / (1 + eps_p)
                 break
@@ -345,11 +520,12 @@ class IMMAlgorithm(BaseRISAlgorithm):
         lambda_star = 2 * n * ((1 - 1 / math.e) * alpha + beta) ** 2 / (self.eps ** 2)
         theta_star = lambda_star / LB
 
-        while len(R) < theta_star:
-            v = random.choice(list(self.graph.nodes))
-            R.append(self.rr_func(v))
+        batch = self._sample_rr_sets(max(0, math.ceil(theta_star) - num_R))
+        rr_data, rr_len = self._concat_rr_sets(batch)
+        data_chunks.append(rr_data)
+        len_chunks.append(rr_len)
 
-        return R
+        return self._build_rr_csr(data_chunks, len_chunks)
 
     def run(self, k: int) -> List[int]:
         """
@@ -362,10 +538,10 @@ class IMMAlgorithm(BaseRISAlgorithm):
             Set[int]: 选出的种子节点集合
         """
         logger.info(f"开始采样阶段...")
-        R = self._sampling(k)
-        logger.info(f"反向可达集数量 |R| = {len(R)}")
+        rr_data, rr_ptr = self._sampling(k)
+        logger.info(f"反向可达集数量 |R| = {len(rr_ptr) - 1}")
 
         logger.info(f"开始节点选择阶段...")
-        seeds, _ = self._node_selection(R, k)
+        seeds, _ = self._node_selection(rr_data, rr_ptr, k)
         # logger.info(f"选出的种子节点: {sorted(Sk)}")
         return list(seeds)
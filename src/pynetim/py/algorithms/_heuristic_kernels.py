@@ -0,0 +1,50 @@
+"""
+启发式算法的Numba内核。
+
+内核在正向CSR数组(indptr, indices, weights)上运行。未安装numba时
+NUMBA_AVAILABLE为False，调用方应回退到纯Python实现。
+"""
+import numpy as np
+
+from .._jit import NUMBA_AVAILABLE, njit
+
+
+@njit("int64[:](int32[:], int32[:], float32[:], int64[:], int64)", cache=True)
+def degree_discount(indptr, indices, weights, degree, k):
+    """
+    度折扣选点。
+
+    每轮选择折扣度最大的节点（并列时取编号最小者），
+    再按 dd[v] = d[v] - 2t[v] - (d[v] - t[v]) * t[v] * p(u, v) 更新其未选中出邻居的折扣度。
+
+    Args:
+        indptr (np.ndarray): 正向CSR行指针
+        indices (np.ndarray): 正向CSR列索引（出邻居编号）
+        weights (np.ndarray): 与indices对齐的边权重
+        degree (np.ndarray): 按节点编号的初始度
+        k (int): 需要选择的种子节点数量
+
+    Returns:
+        np.ndarray: 选出的节点编号数组
+    """
+    n = len(indptr) - 1
+    d = degree.astype(np.float64)
+    dd = d.copy()
+    t = np.zeros(n, dtype=np.int64)
+    selected = np.zeros(n, dtype=np.uint8)
+    seeds = np.empty(min(k, n), dtype=np.int64)
+
+    for i in range(len(seeds)):
+        u = np.argmax(dd)
+        seeds[i] = u
+        selected[u] = 1
+        dd[u] = -np.inf
+
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            if selected[v]:
+                continue
+            t[v] += 1
+            dd[v] = d[v] - 2 * t[v] - (d[v] - t[v]) * t[v] * weights[j]
+
+    return seeds
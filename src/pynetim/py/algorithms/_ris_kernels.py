@@ -0,0 +1,143 @@
+"""
+RR集合采样的Numba内核。
+
+内核直接在反向CSR数组(indptr, indices, weights)上运行，访问标记与队列使用调用方
+预先分配的缓冲区，每次采样结束后只复位被访问过的位置。未安装numba时
+NUMBA_AVAILABLE为False，调用方应回退到纯Python实现。
+"""
+import numpy as np
+
+from .._jit import NUMBA_AVAILABLE, njit
+
+
+@njit("void(int64)", cache=True)
+def seed_kernels(seed):
+    """
+    设置Numba内核使用的随机数种子。
+
+    Numba内核拥有独立于numpy全局状态的随机数生成器，必须在编译后的代码中设置种子。
+
+    Args:
+        seed (int): 随机种子
+    """
+    np.random.seed(seed)
+
+
+@njit("int32[:](int64, int32[:], int32[:], float32[:], int8[:], int32[:])", cache=True)
+def sample_rr_ic(start, indptr, indices, weights, visited_buf, queue_buf):
+    """
+    IC模型：从起始节点反向BFS采样可达节点。
+
+    Args:
+        start (int): 起始节点编号
+        indptr (np.ndarray): 反向CSR行指针
+        indices (np.ndarray): 反向CSR列索引
+        weights (np.ndarray): 与indices对齐的边权重
+        visited_buf (np.ndarray): 长度为n的访问标记缓冲区，调用前后均为全0
+        queue_buf (np.ndarray): 长度为n的队列缓冲区
+
+    Returns:
+        np.ndarray: 反向可达节点的编号数组
+    """
+    head = 0
+    tail = 1
+    queue_buf[0] = start
+    visited_buf[start] = 1
+    while head < tail:
+        u = queue_buf[head]
+        head += 1
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if visited_buf[v] == 0 and np.random.random() <= weights[i]:
+                visited_buf[v] = 1
+                queue_buf[tail] = v
+                tail += 1
+
+    # 队列即为本次访问过的节点，据此复位访问标记
+    for i in range(tail):
+        visited_buf[queue_buf[i]] = 0
+    return queue_buf[:tail].copy()
+
+
+@njit("int32[:](int64, int32[:], int32[:], int8[:], int32[:])", cache=True)
+def sample_rr_lt(start, indptr, indices, visited_buf, queue_buf):
+    """
+    LT模型：从起始节点反向随机走一条路径。
+
+    Args:
+        start (int): 起始节点编号
+        indptr (np.ndarray): 反向CSR行指针
+        indices (np.ndarray): 反向CSR列索引
+        visited_buf (np.ndarray): 长度为n的访问标记缓冲区，调用前后均为全0
+        queue_buf (np.ndarray): 长度为n的路径缓冲区
+
+    Returns:
+        np.ndarray: 反向可达节点的编号数组
+    """
+    length = 1
+    queue_buf[0] = start
+    visited_buf[start] = 1
+    current = start
+    while True:
+        s = indptr[current]
+        e = indptr[current + 1]
+        if s == e:
+            break
+        # 随机选择一个前驱（等概率）
+        pred = indices[np.random.randint(s, e)]
+        if visited_buf[pred] != 0:
+            break  # 遇到已激活节点，停止
+        visited_buf[pred] = 1
+        queue_buf[length] = pred
+        length += 1
+        current = pred
+
+    for i in range(length):
+        visited_buf[queue_buf[i]] = 0
+    return queue_buf[:length].copy()
+
+
+@njit("Tuple((int64[:], int64))(int32[:], int64[:], int32[:], int64[:], int64, int64)", cache=True)
+def greedy_select(rr_data, rr_ptr, node_rr_idx, node_rr_ptr, n, k):
+    """
+    最大覆盖贪心选点。
+
+    每轮选择覆盖未覆盖RR集合最多的节点（并列时取编号最小者），
+    并将其新覆盖的RR集合中所有节点的覆盖度减一。
+
+    Args:
+        rr_data (np.ndarray): 所有RR集合拼接后的节点编号数组
+        rr_ptr (np.ndarray): RR集合的CSR行指针
+        node_rr_idx (np.ndarray): 倒排表，按节点分组的RR集合编号
+        node_rr_ptr (np.ndarray): 倒排表的CSR行指针
+        n (int): 节点数量
+        k (int): 需要选择的种子节点数量
+
+    Returns:
+        Tuple[np.ndarray, int]: 选出的节点编号数组和被覆盖的RR集合数量
+    """
+    rr_degree = np.empty(n, dtype=np.int32)
+    for v in range(n):
+        rr_degree[v] = node_rr_ptr[v + 1] - node_rr_ptr[v]
+    rr_covered = np.zeros(len(rr_ptr) - 1, dtype=np.uint8)
+    seeds = np.empty(k, dtype=np.int64)
+    num_seeds = 0
+    matched_count = 0
+
+    for _ in range(k):
+        max_node = np.argmax(rr_degree)
+        if rr_degree[max_node] == 0:
+            break
+        seeds[num_seeds] = max_node
+        num_seeds += 1
+
+        for j in range(node_rr_ptr[max_node], node_rr_ptr[max_node + 1]):
+            rr_idx = node_rr_idx[j]
+            if rr_covered[rr_idx]:
+                continue
+            rr_covered[rr_idx] = 1
+            matched_count += 1
+            for i in range(rr_ptr[rr_idx], rr_ptr[rr_idx + 1]):
+                rr_degree[rr_data[i]] -= 1
+
+    return seeds[:num_seeds], matched_count
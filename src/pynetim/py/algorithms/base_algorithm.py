@@ -3,6 +3,12 @@ from __future__ import annotations
 from ..diffusion_model import BaseDiffusionModel, IndependentCascadeModel, LinearThresholdModel
 from ..graph import IMGraphPy
 
+# 扩散模型名称到模型类的映射
+_MODEL_MAP = {
+    'IC': IndependentCascadeModel,
+    'LT': LinearThresholdModel,
+}
+
 
 class BaseAlgorithm:
     """
@@ -30,14 +36,11 @@ class BaseAlgorithm:
         self.seeds = []
 
         if diffusion_model is not None:
-            self.diffusion_model = IndependentCascadeModel
             if isinstance(diffusion_model, str):
-                if diffusion_model == 'IC':
-                    self.diffusion_model = IndependentCascadeModel
-                elif diffusion_model == 'LT':
-                    self.diffusion_model = LinearThresholdModel
-                else:
-                    raise ValueError("不支持的模型：请选择 'IC' 或 'LT'")
+                try:
+                    self.diffusion_model = _MODEL_MAP[diffusion_model.upper()]
+                except KeyError:
+                    raise ValueError("不支持的模型：请选择 'IC' 或 'LT'") from None
             else:
                 self.diffusion_model = diffusion_model
 
@@ -1,9 +1,9 @@
 import heapq
 import time
-from collections import defaultdict
 
 from ..graph import IMGraphPy
 from .base_algorithm import BaseAlgorithm
+from ._heuristic_kernels import NUMBA_AVAILABLE, degree_discount
 
 
 class SingleDiscountAlgorithm(BaseAlgorithm):
@@ -91,6 +91,9 @@ class DegreeDiscountAlgorithm(BaseAlgorithm):
             diffusion_model (str, optional): 扩散模型，默认为'IC'
         """
         super(DegreeDiscountAlgorithm, self).__init__(graph, diffusion_model)
+        self.nodes = graph.node_list
+        # 度取自图缓存的出度数组，与 graph.out_degree() 一致（无向图自环计为2）
+        self.degrees = graph.out_degree_array
 
     def run(self, k: int):
         """
@@ -102,32 +105,40 @@ class DegreeDiscountAlgorithm(BaseAlgorithm):
         Returns:
             list: 选择的种子节点列表
         """
-        d = dict(self.graph.out_degree())  # 节点的度
+        if NUMBA_AVAILABLE:
+            seeds = [self.nodes[i] for i in degree_discount(self.graph.indptr, self.graph.indices, self.graph.weights, self.degrees, k).tolist()]
+            self.seeds = seeds
+            return seeds
+
+        indptr, indices, weights = self.graph.indptr.tolist(), self.graph.indices.tolist(), self.graph.weights.tolist()
+        n = len(self.nodes)
+        d = self.degrees.tolist()  # 节点的度
         dd = d.copy()  # 折扣度 degree discount
-        t = defaultdict(int)  # t[v]: 节点v已被选为邻居种子的数量
+        t = [0] * n  # t[v]: 节点v已被选为邻居种子的数量
         seeds = []  # 最终种子集合
 
         # 使用最大堆存储 (-折扣度, 节点)，注意 heapq 是最小堆，所以取负值
-        heap = [(-dd[v], v) for v in self.graph.nodes]
+        heap = [(-dd[v], v) for v in range(n)]
         heapq.heapify(heap)
         selected = set()
 
-        while len(seeds) < k:
-            _, u = heapq.heappop(heap)
-            if u in selected:
+        while len(seeds) < min(k, n):
+            neg_dd, u = heapq.heappop(heap)
+            # 折扣度更新后旧条目仍留在堆中，出堆时跳过
+            if u in selected or -neg_dd != dd[u]:
                 continue
             seeds.append(u)
             selected.add(u)
 
-            for v in self.graph.out_neighbors(u):
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
                 if v in selected:
                     continue
                 t[v] += 1
-                # 获取边的权重
-                weight = self.graph.edges[u, v]["weight"]
                 # 更新折扣度
-                dd[v] = d[v] - 2 * t[v] - (d[v] - t[v]) * t[v] * weight
+                dd[v] = d[v] - 2 * t[v] - (d[v] - t[v]) * t[v] * weights[j]
                 heapq.heappush(heap, (-dd[v], v))  # 更新堆中的节点
 
+        seeds = [self.nodes[u] for u in seeds]
         self.seeds = seeds
         return seeds
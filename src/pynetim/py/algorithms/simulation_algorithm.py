@@ -1,5 +1,7 @@
 import copy
 import heapq
+import math
+from multiprocessing import Pool, cpu_count
 
 from tqdm import tqdm
 
@@ -7,6 +9,49 @@ from ..graph import IMGraphPy
 from ..diffusion_model import run_monte_carlo_diffusion, BaseDiffusionModel
 from .base_algorithm import BaseAlgorithm
 
+# 工作进程中的扩散模型实例，由进程池的initializer在进程启动时设置一次
+_WORKER_MODEL = None
+
+
+def _mc_worker_init(diffusion_model: BaseDiffusionModel):
+    """
+    贪婪算法多进程评估的进程初始化函数。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): 扩散模型实例（含图结构）
+    """
+    global _WORKER_MODEL
+    _WORKER_MODEL = diffusion_model
+
+
+def _evaluate_candidate(diffusion_model: BaseDiffusionModel, task: tuple):
+    """
+    评估一个种子集合的平均影响力。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): 扩散模型实例
+        task (tuple): (候选序号, 种子列表, 蒙特卡洛模拟次数, 随机种子)
+
+    Returns:
+        tuple: (候选序号, 平均影响力)
+    """
+    idx, seeds, mc_rounds, random_seed = task
+    diffusion_model.reset(seeds)
+    return idx, run_monte_carlo_diffusion(diffusion_model, mc_rounds, random_seed=random_seed)
+
+
+def _mc_worker(task: tuple):
+    """
+    贪婪算法多进程评估的任务函数，使用进程内缓存的扩散模型。
+
+    Args:
+        task (tuple): 同 _evaluate_candidate
+
+    Returns:
+        tuple: 同 _evaluate_candidate
+    """
+    return _evaluate_candidate(_WORKER_MODEL, task)
+
 
 class GreedyAlgorithm(BaseAlgorithm):
     """
@@ -45,44 +90,76 @@ class GreedyAlgorithm(BaseAlgorithm):
 
         Returns:
             list: 选择的种子节点列表
+
+        Raises:
+            ValueError: k大于图中节点数时抛出
         """
         seeds = set()
         nodes = set(self.graph.nodes())
+        if k > len(nodes):
+            raise ValueError(f"种子节点数量k({k})不能大于图中节点数({len(nodes)})")
         diffusion_model = self.diffusion_model_class(self.graph, list(seeds))
 
+        # 多进程模式下整个运行过程只创建一次进程池，扩散模型在进程启动时传递一次
+        pool = None
+        if multi_process:
+            if processes is None:
+                processes = cpu_count()
+            pool = Pool(processes=processes, initializer=_mc_worker_init, initargs=(diffusion_model,))
+
         # 外层循环进度条 - 选择种子节点的进度
         outer_pbar = tqdm(range(k), desc="选择种子节点", disable=not show_progress)
 
-        for i in outer_pbar:
-            best_node = None
-            best_gain = -1
-
-            node_list = list(nodes - seeds)
-            # 内层循环进度条 - 遍历候选节点的进度
-            inner_pbar = tqdm(node_list, desc=f"评估候选节点({i+1}/{k})",
-                             leave=False, disable=not show_progress)
-
-            for node in inner_pbar:
-                # 更新模型种子集合，重置模型
-                diffusion_model.reset(list(seeds | {node}))
-                avg_influence = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process, processes, random_seed)
-                # 更新模型种子集合，重置模型
-                diffusion_model.reset(list(seeds))
-                avg_without = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process, processes, random_seed)
-                marginal_gain = avg_influence - avg_without
-
-                if marginal_gain > best_gain:
-                    best_gain = marginal_gain
-                    best_node = node
-
-                # 在进度条上显示当前最佳边际增益
-                if show_progress:
-                    inner_pbar.set_postfix({'当前最佳增益': f'{best_gain:.4f}'})
+        try:
+            for i in outer_pbar:
+                best_idx = None
+                best_gain = -math.inf
+
+                # σ(S)与候选节点无关，每轮只计算一次；空集的影响力为0
+                avg_without = 0.0
+                if seeds:
+                    without_task = (-1, list(seeds), mc_rounds, random_seed)
+                    if pool is not None:
+                        _, avg_without = pool.apply(_mc_worker, (without_task,))
+                    else:
+                        _, avg_without = _evaluate_candidate(diffusion_model, without_task)
+
+                node_list = list(nodes - seeds)
+                tasks = [(idx, list(seeds | {node}), mc_rounds, random_seed)
+                         for idx, node in enumerate(node_list)]
+                if pool is not None:
+                    # 每个任务完整评估一个候选节点，按完成顺序取回
+                    chunksize = max(1, len(tasks) // (processes * 4))
+                    results = pool.imap_unordered(_mc_worker, tasks, chunksize=chunksize)
+                else:
+                    results = (_evaluate_candidate(diffusion_model, task) for task in tasks)
+
+                # 内层循环进度条 - 遍历候选节点的进度
+                inner_pbar = tqdm(results, total=len(tasks), desc=f"评估候选节点({i+1}/{k})",
+                                  leave=False, disable=not show_progress)
 
-            seeds.add(best_node)
-            # 更新外层进度条描述信息
-            if show_progress:
-                outer_pbar.set_description(f"已选中节点: {best_node}")
+                for idx, avg_influence in inner_pbar:
+                    marginal_gain = avg_influence - avg_without
+
+                    # 增益相同时取候选列表中靠前的节点，保证多进程与单进程结果一致
+                    if marginal_gain > best_gain or (
+                            marginal_gain == best_gain and best_idx is not None and idx < best_idx):
+                        best_gain = marginal_gain
+                        best_idx = idx
+
+                    # 在进度条上显示当前最佳边际增益
+                    if show_progress:
+                        inner_pbar.set_postfix({'当前最佳增益': f'{best_gain:.4f}'})
+
+                best_node = node_list[best_idx]
+                seeds.add(best_node)
+                # 更新外层进度条描述信息
+                if show_progress:
+                    outer_pbar.set_description(f"已选中节点: {best_node}")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
         self.seeds = list(seeds)
         return list(seeds)
@@ -129,6 +206,8 @@ class CELFAlgorithm(BaseAlgorithm):
         """
         seeds = set()
         nodes = set(self.graph.nodes())
+        # 当前种子集合的影响力 σ(S)，空集为0，选中节点时按其边际增益累加
+        current_spread = 0.0
 
         # Initialize marginal gains
         heap = []
@@ -140,36 +219,32 @@ class CELFAlgorithm(BaseAlgorithm):
         diffusion_model = self.diffusion_model_class(self.graph, [])
         for node in init_pbar:
             diffusion_model.reset([node])
-            mg = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process, processes, random_seed)
+            mg = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process=multi_process,
+                                           processes=processes, random_seed=random_seed)
             heap.append((-mg, node, 0))  # (负边际增益, 节点, 上次计算时种子集合大小)
         heapq.heapify(heap)
 
-        selected = 0
         # 主循环进度条
         main_pbar = tqdm(range(k), desc="选择种子节点", disable=not show_progress)
 
-        # 创建一个扩散模型实例用于后续计算
-        diffusion_model = self.diffusion_model_class(self.graph, list(seeds))
-
         for _ in main_pbar:
             while True:
                 neg_gain, node, last_s_size = heapq.heappop(heap)
 
                 if last_s_size == len(seeds):
-                    # 新增种子节点
+                    # 新增种子节点，σ(S∪{u}) = σ(S) + 边际增益
                     seeds.add(node)
-                    selected += 1
+                    current_spread += -neg_gain
                     if show_progress:
                         main_pbar.set_description(f"已选中节点: {node}")
                     break
                 else:
-                    # 重新计算该节点边际增益
+                    # 重新计算该节点边际增益，σ(S)已缓存，只需模拟 S∪{u}
                     diffusion_model.reset(list(seeds | {node}))
-                    avg_with = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process, processes, random_seed)
-                    diffusion_model.reset(list(seeds))
-                    avg_without = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process, processes, random_seed)
-                    marginal_gain = avg_with - avg_without
-                    heapq.heappush(heap, (-marginal_gain, node, len(seeds)))  # 修复变量名
+                    avg_with = run_monte_carlo_diffusion(diffusion_model, mc_rounds, multi_process=multi_process,
+                                                         processes=processes, random_seed=random_seed)
+                    marginal_gain = avg_with - current_spread
+                    heapq.heappush(heap, (-marginal_gain, node, len(seeds)))
 
         self.seeds = list(seeds)
         return list(seeds)
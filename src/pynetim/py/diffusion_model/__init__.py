@@ -1,7 +1,7 @@
 from .base_diffusion_model import BaseDiffusionModel
 from .independent_cascade_model import IndependentCascadeModel
 from .linear_threshold_model import LinearThresholdModel
-from .run_monte_carlo_diffusion import run_monte_carlo_diffusion
+from .run_monte_carlo_diffusion import run_monte_carlo_diffusion, run_monte_carlo_diffusion_batched
 from .susceptible_infected_model import SusceptibleInfectedModel
 from .susceptible_infected_recovered_model import SusceptibleInfectedRecoveredModel
 
@@ -9,6 +9,7 @@ __all__ = [
     'IndependentCascadeModel',
     'LinearThresholdModel',
     'run_monte_carlo_diffusion',
+    'run_monte_carlo_diffusion_batched',
     'SusceptibleInfectedModel',
     'SusceptibleInfectedRecoveredModel'
 ]
@@ -0,0 +1,102 @@
+"""
+批量IC蒙特卡洛模拟的CuPy（GPU）实现。
+
+传播过程以数组模块 xp 编写，GPU上 xp 为 cupy，同一套代码也可以用 numpy 在CPU上运行。
+未安装cupy时 CUPY_AVAILABLE 为 False。
+"""
+import numpy as np
+
+try:
+    import cupy as cp
+    import cupyx
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+
+def batched_ic_cuda(graph, seeds: np.ndarray, mc_rounds: int, batch: int, update_counts: int = None,
+                    random_seed: int = None) -> float:
+    """
+    在GPU上以批量方式执行IC模型的蒙特卡洛模拟。
+
+    Args:
+        graph (IMGraphPy): 图对象，使用其出边CSR数组
+        seeds (np.ndarray): 种子节点编号数组
+        mc_rounds (int): 蒙特卡洛模拟总轮数
+        batch (int): 每批并行推进的模拟次数
+        update_counts (int, optional): 每次模拟的最大传播轮次
+        random_seed (int, optional): 随机种子，默认为None
+
+    Returns:
+        float: 所有模拟轮次的平均激活节点数
+
+    Raises:
+        ImportError: 未安装cupy时抛出
+    """
+    if not CUPY_AVAILABLE:
+        raise ImportError("cupy is required for device='cuda'. Install it with: pip install cupy-cuda12x")
+    return _batched_ic(cp, cupyx.scatter_add, cp.random.default_rng(random_seed),
+                       cp.asarray(graph.indptr), cp.asarray(graph.indices), cp.asarray(graph.weights),
+                       graph.number_of_nodes, cp.asarray(seeds), mc_rounds, batch, update_counts)
+
+
+def _batched_ic(xp, scatter_add, rng, indptr, indices, weights, n, seeds, mc_rounds, batch, update_counts):
+    """
+    与数组模块无关的批量IC传播。
+
+    节点状态为形状 (n, batch) 的布尔矩阵。每轮取出所有列前沿节点的出边，
+    对 (边数, batch) 个随机数做一次比较，再按目标节点将命中次数累加到 (n, batch) 的计数矩阵。
+
+    Args:
+        xp (module): 数组模块，cupy 或 numpy
+        scatter_add (Callable): 带重复下标的原地累加函数，如 cupyx.scatter_add 或 np.add.at
+        rng: xp 对应的随机数生成器
+        indptr (ndarray): 出边CSR行指针
+        indices (ndarray): 出边CSR列索引
+        weights (ndarray): 与indices对齐的边权重
+        n (int): 节点数量
+        seeds (ndarray): 种子节点编号数组
+        mc_rounds (int): 蒙特卡洛模拟总轮数
+        batch (int): 每批并行推进的模拟次数
+        update_counts (int, optional): 每次模拟的最大传播轮次
+
+    Returns:
+        float: 所有模拟轮次的平均激活节点数
+    """
+    total = 0
+    for start in range(0, mc_rounds, batch):
+        width = min(batch, mc_rounds - start)
+        activated = xp.zeros((n, width), dtype=bool)
+        activated[seeds] = True
+        frontier = activated.copy()
+
+        count = 0
+        while True:
+            frontier_nodes = xp.flatnonzero(frontier.any(axis=1))
+            if frontier_nodes.size == 0:
+                break
+
+            # 由各前沿节点的出边数得到每条边所属的前沿节点，再拼出边编号
+            starts = indptr[frontier_nodes]
+            counts = indptr[frontier_nodes + 1] - starts
+            ends = xp.cumsum(counts)
+            num_edges = int(ends[-1])
+            positions = xp.arange(num_edges)
+            owner = xp.searchsorted(ends, positions, side='right')
+            edge_ids = starts[owner] + positions - (ends - counts)[owner]
+
+            fired = rng.random((num_edges, width), dtype=xp.float32) < weights[edge_ids, None]
+            fired &= frontier[frontier_nodes[owner]]
+            hits = xp.zeros((n, width), dtype=xp.int32)
+            scatter_add(hits, indices[edge_ids], fired.astype(xp.int32))
+
+            frontier = (hits > 0) & ~activated
+            activated |= frontier
+
+            count += 1
+            if update_counts and count >= update_counts:
+                break
+
+        total += int(activated.sum())
+
+    return total / mc_rounds
@@ -0,0 +1,232 @@
+"""
+扩散模型单轮传播的Numba内核。
+
+内核直接在IMGraphPy的出边CSR数组(indptr, indices, weights)上运行，节点状态使用按编号
+索引的uint8标记数组。未安装numba时NUMBA_AVAILABLE为False，内核退化为普通Python函数，
+调用方可改用NumPy实现。
+"""
+import numpy as np
+
+from .._jit import NUMBA_AVAILABLE, njit
+
+
+@njit("void(int64)", cache=True)
+def seed_kernels(seed):
+    """
+    设置Numba内核使用的随机数种子。
+
+    Numba内核拥有独立于numpy全局状态的随机数生成器，必须在编译后的代码中设置种子。
+
+    Args:
+        seed (int): 随机种子
+    """
+    np.random.seed(seed)
+
+
+@njit("int32[:](int32[:], int32[:], float32[:], int32[:], uint8[:])", cache=True)
+def ic_step(indptr, indices, weights, frontier, activated):
+    """
+    IC模型：前沿节点沿出边各尝试激活一次邻居。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        weights (np.ndarray): 与indices对齐的边权重
+        frontier (np.ndarray): 本轮尝试传播的节点编号
+        activated (np.ndarray): 激活标记，原地更新
+
+    Returns:
+        np.ndarray: 本轮新激活的节点编号
+    """
+    total = 0
+    for u in frontier:
+        total += indptr[u + 1] - indptr[u]
+    new_nodes = np.empty(min(total, len(activated)), dtype=np.int32)
+    count = 0
+    for u in frontier:
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if activated[v] == 0 and np.random.random() < weights[i]:
+                activated[v] = 1
+                new_nodes[count] = v
+                count += 1
+    return new_nodes[:count].copy()
+
+
+@njit("int32[:](int32[:], int32[:], float64, int32[:], uint8[:])", cache=True)
+def ic_step_const(indptr, indices, weight, frontier, activated):
+    """
+    IC模型：所有边权重相同时的ic_step，不读取逐边权重。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        weight (float): 所有边共同的权重
+        frontier (np.ndarray): 本轮尝试传播的节点编号
+        activated (np.ndarray): 激活标记，原地更新
+
+    Returns:
+        np.ndarray: 本轮新激活的节点编号
+    """
+    total = 0
+    for u in frontier:
+        total += indptr[u + 1] - indptr[u]
+    new_nodes = np.empty(min(total, len(activated)), dtype=np.int32)
+    count = 0
+    for u in frontier:
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if activated[v] == 0 and np.random.random() < weight:
+                activated[v] = 1
+                new_nodes[count] = v
+                count += 1
+    return new_nodes[:count].copy()
+
+
+@njit("int32[:](int32[:], int32[:], float32[:], int32[:], uint8[:])", cache=True)
+def ic_step_wc(indptr, indices, inv_in_degree, frontier, activated):
+    """
+    IC模型：边权重等于目标节点入度倒数（WC）时的ic_step，按目标节点读取权重。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        inv_in_degree (np.ndarray): 按节点编号的入度倒数
+        frontier (np.ndarray): 本轮尝试传播的节点编号
+        activated (np.ndarray): 激活标记，原地更新
+
+    Returns:
+        np.ndarray: 本轮新激活的节点编号
+    """
+    total = 0
+    for u in frontier:
+        total += indptr[u + 1] - indptr[u]
+    new_nodes = np.empty(min(total, len(activated)), dtype=np.int32)
+    count = 0
+    for u in frontier:
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if activated[v] == 0 and np.random.random() < inv_in_degree[v]:
+                activated[v] = 1
+                new_nodes[count] = v
+                count += 1
+    return new_nodes[:count].copy()
+
+
+@njit("int32[:](int32[:], int32[:], float32[:], int32[:], uint8[:], float64[:], float64[:])", cache=True)
+def lt_step(indptr, indices, weights, frontier, activated, in_sum, theta):
+    """
+    LT模型：将前沿节点的影响力累加到未激活邻居上，累计影响力达到阈值即激活。
+
+    in_sum保存本次模拟中每个节点已累加的来自已激活入邻居的影响力，只在新激活节点
+    的出边上增量更新，不再对入边重新求和。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        weights (np.ndarray): 与indices对齐的边权重
+        frontier (np.ndarray): 上一轮新激活的节点编号
+        activated (np.ndarray): 激活标记，原地更新
+        in_sum (np.ndarray): 按节点编号的累计影响力，原地更新
+        theta (np.ndarray): 按节点编号的激活阈值，整个模拟过程中保持不变
+
+    Returns:
+        np.ndarray: 本轮新激活的节点编号
+    """
+    total = 0
+    for u in frontier:
+        total += indptr[u + 1] - indptr[u]
+    new_nodes = np.empty(min(total, len(activated)), dtype=np.int32)
+    count = 0
+    for u in frontier:
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if activated[v] != 0:
+                continue
+            in_sum[v] += weights[i]
+            if in_sum[v] >= theta[v]:
+                activated[v] = 1
+                new_nodes[count] = v
+                count += 1
+    return new_nodes[:count].copy()
+
+
+@njit("int64(int32[:], int32[:], uint8[:], int32[:], int64, float64)", cache=True)
+def si_step(indptr, indices, infected, order, count, beta):
+    """
+    SI模型：所有已感染节点以概率beta感染每个易感邻居。
+
+    order[:count]为已感染节点，本轮新感染的节点追加在其后，且不在本轮继续传播。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        infected (np.ndarray): 感染标记，原地更新
+        order (np.ndarray): 长度为n的已感染节点列表
+        count (int): 本轮开始时的已感染节点数
+        beta (float): 感染概率
+
+    Returns:
+        int: 本轮结束时的已感染节点数
+    """
+    new_count = count
+    for j in range(count):
+        u = order[j]
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if infected[v] == 0 and np.random.random() < beta:
+                infected[v] = 1
+                order[new_count] = v
+                new_count += 1
+    return new_count
+
+
+@njit("UniTuple(int64, 3)(int32[:], int32[:], uint8[:], uint8[:], int32[:], int64, int32[:], float64, float64)",
+      cache=True)
+def sir_step(indptr, indices, infected, recovered, order, count, recovered_buf, beta, gamma):
+    """
+    SIR模型：感染节点以概率gamma康复，未康复的节点以概率beta感染易感邻居。
+
+    康复与传播在同一次遍历中完成。order[:count]为感染节点，康复的节点从order中移除
+    并写入recovered_buf，剩余感染节点前移。本轮新感染的节点先从尾部写入recovered_buf，
+    遍历结束后再追加到剩余感染节点之后，因此不会在本轮继续传播。
+
+    Args:
+        indptr (np.ndarray): 出边CSR行指针
+        indices (np.ndarray): 出边CSR列索引
+        infected (np.ndarray): 感染标记，原地更新
+        recovered (np.ndarray): 康复标记，原地更新
+        order (np.ndarray): 长度为n的感染节点列表
+        count (int): 本轮开始时的感染节点数
+        recovered_buf (np.ndarray): 长度为n的缓冲区，用于返回本轮康复的节点
+        beta (float): 感染概率
+        gamma (float): 康复概率
+
+    Returns:
+        Tuple[int, int, int]: 康复后剩余的感染节点数、本轮结束时的感染节点数、本轮康复的节点数
+    """
+    n = len(order)
+    kept = 0
+    num_recovered = 0
+    num_new = 0
+    for j in range(count):
+        u = order[j]
+        if np.random.random() < gamma:
+            infected[u] = 0
+            recovered[u] = 1
+            recovered_buf[num_recovered] = u
+            num_recovered += 1
+            continue
+        order[kept] = u
+        kept += 1
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if infected[v] == 0 and recovered[v] == 0 and np.random.random() < beta:
+                infected[v] = 1
+                num_new += 1
+                # 康复节点与新感染节点互不重叠且总数不超过n，可共用同一缓冲区的两端
+                recovered_buf[n - num_new] = v
+
+    for j in range(num_new):
+        order[kept + j] = recovered_buf[n - 1 - j]
+    return kept, kept + num_new, num_recovered
@@ -1,4 +1,10 @@
+import numpy as np
+
 from ..graph import IMGraphPy
+from ._kernels import NUMBA_AVAILABLE, seed_kernels
+
+# 当前进程中Numba内核随机数状态对应的生成器，内核状态是进程级的，只在换用生成器时重新播种
+_KERNEL_RNG = None
 
 
 class BaseDiffusionModel:
@@ -13,7 +19,8 @@ class BaseDiffusionModel:
         graph (IMGraph): 表示传播网络结构
         init_seeds (list): 初始种子集
         record_states (bool): 指示是否记录传播过程中的状态变化
-        states (list): 当record_states为True时存储传播过程的状态历史
+        states (list): 当record_states为True时存储传播过程的状态历史，每项为节点编号数组（np.int32）
+        rng (np.random.Generator): 传播过程使用的随机数生成器
     """
 
     def __init__(self, graph: IMGraphPy, init_seeds: list, record_states: bool = False):
@@ -28,9 +35,102 @@ class BaseDiffusionModel:
         self.graph = graph
         self.init_seeds = init_seeds.copy()
         self.record_states = record_states
+        self.rng = np.random.default_rng()
 
         if self.record_states:
-            self.states = [set(init_seeds)]
+            self.states = [self._seed_indices()]
+
+    @property
+    def init_seeds(self) -> list:
+        """
+        初始种子集。
+
+        赋值时即转换为节点编号并缓存，之后每次重置与传播直接使用编号数组。
+        原地修改该列表不会更新缓存，需要重新赋值或调用 reset(init_seeds)。
+        """
+        return self._init_seeds
+
+    @init_seeds.setter
+    def init_seeds(self, init_seeds: list):
+        index = self.graph.node_index
+        self._init_seeds = init_seeds
+        self._seed_ids = np.unique(np.fromiter((index[node] for node in init_seeds), dtype=np.int32,
+                                               count=len(init_seeds)))
+
+    def _seed_indices(self) -> np.ndarray:
+        """
+        返回去重后的初始种子节点编号数组。
+
+        返回的是缓存数组本身，调用方不应原地修改。
+
+        Returns:
+            np.ndarray: 种子节点在图CSR中的编号，int32
+        """
+        return self._seed_ids
+
+    def _use_rng(self, rng: np.random.Generator):
+        """
+        设置后续传播使用的随机数生成器。
+
+        Numba内核使用独立的进程级随机数状态，首次使用某个生成器时从中取一个种子同步设置，
+        之后以同一生成器继续传播时不再重新播种，内核沿用已有的随机流，
+        保证同一生成器按相同顺序调用时得到可复现的结果。
+
+        Args:
+            rng (np.random.Generator): 随机数生成器
+        """
+        global _KERNEL_RNG
+        self.rng = rng
+        if NUMBA_AVAILABLE and rng is not _KERNEL_RNG:
+            seed_kernels(int(rng.integers(2 ** 63 - 1)))
+            _KERNEL_RNG = rng
+
+    @staticmethod
+    def _edge_ids(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """
+        拼接一组节点在CSR中的边区间。
+
+        Args:
+            indptr (np.ndarray): CSR行指针
+            nodes (np.ndarray): 节点编号数组
+
+        Returns:
+            np.ndarray: 按nodes顺序排列的所有边编号
+        """
+        starts = indptr[nodes]
+        counts = indptr[nodes + 1] - starts
+        total = int(counts.sum())
+        return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+    def _to_nodes(self, indices) -> set:
+        """
+        将节点编号转换为节点集合。
+
+        Args:
+            indices (Iterable[int]): 节点在图CSR中的编号
+
+        Returns:
+            set: 对应的节点集合
+        """
+        return set(self.graph.id_to_orig[np.asarray(indices, dtype=np.intp)].tolist())
+
+    def states_as_sets(self) -> list:
+        """
+        将记录的状态历史转换为节点集合形式。
+
+        states中保存的是节点编号数组，该方法按原节点标识返回，
+        字典形式的状态（如SIR）逐项转换。
+
+        Returns:
+            list: 与states一一对应的节点集合（或值为节点集合的字典）列表
+        """
+        result = []
+        for state in self.states:
+            if isinstance(state, dict):
+                result.append({key: self._to_nodes(value) for key, value in state.items()})
+            else:
+                result.append(self._to_nodes(state))
+        return result
 
     def update(self):
         """
@@ -47,7 +147,7 @@ class BaseDiffusionModel:
         """
         raise NotImplementedError
 
-    def diffusion(self, update_counts: int = None):
+    def diffusion(self, update_counts: int = None, rng: np.random.Generator = None):
         """
         执行完整扩散过程的抽象方法。
 
@@ -55,6 +155,7 @@ class BaseDiffusionModel:
 
         Args:
             update_counts (int, optional): 更新次数，控制扩散迭代的轮数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
 
         Returns:
             扩散结果，具体类型由子类定义
@@ -64,6 +165,21 @@ class BaseDiffusionModel:
         """
         raise NotImplementedError
 
+    def _diffusion_size(self, update_counts: int = None, rng: np.random.Generator = None) -> int:
+        """
+        执行完整的扩散过程，只返回结果规模。
+
+        默认实现对diffusion的结果取长度，子类可直接从状态标记计数以避免构造节点集合。
+
+        Args:
+            update_counts (int, optional): 更新次数，控制扩散迭代的轮数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+
+        Returns:
+            int: 扩散结果中的节点数
+        """
+        return len(self.diffusion(update_counts, rng))
+
     def run_monte_carlo_diffusion(self, round: int, multi_process: bool = False, processes: int = None):
         """
         执行蒙特卡洛模拟扩散过程。
@@ -91,8 +207,7 @@ class BaseDiffusionModel:
         Args:
             init_seeds (list, optional): 新的初始种子节点集合，若为None则使用原有种子集
         """
-        if init_seeds is None:
-            init_seeds = self.init_seeds
-        self.init_seeds = init_seeds.copy()
+        if init_seeds is not None:
+            self.init_seeds = init_seeds.copy()
         if self.record_states:
-            self.states = [set(self.init_seeds)]
+            self.states = [self._seed_indices()]
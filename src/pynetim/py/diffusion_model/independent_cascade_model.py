@@ -1,8 +1,11 @@
-import random
+import sys
+
+import numpy as np
 
 from .run_monte_carlo_diffusion import run_monte_carlo_diffusion
 from ..graph import IMGraphPy
 from .base_diffusion_model import BaseDiffusionModel
+from ._kernels import NUMBA_AVAILABLE, ic_step, ic_step_const, ic_step_wc
 
 
 class IndependentCascadeModel(BaseDiffusionModel):
@@ -21,10 +24,11 @@ class IndependentCascadeModel(BaseDiffusionModel):
 
     Attributes:
         activated_nodes (set): 所有已被激活的节点集合
+        activated_mask (np.ndarray): 按节点编号的激活标记，uint8
         graph (IMGraph): 表示传播网络结构（继承自BaseDiffusionModel）
         init_seeds (list): 初始种子集（继承自BaseDiffusionModel）
         record_states (bool): 指示是否记录传播过程中的状态变化（继承自BaseDiffusionModel）
-        states (list): 当record_states为True时存储传播过程的状态历史（继承自BaseDiffusionModel）
+        states (list): 当record_states为True时存储传播过程的状态历史，元素为节点编号数组（继承自BaseDiffusionModel）
     """
 
     def __init__(self, graph: IMGraphPy, init_seeds: list, record_states: bool = False):
@@ -37,37 +41,85 @@ class IndependentCascadeModel(BaseDiffusionModel):
             record_states (bool): 控制是否记录每一步的状态，默认为False
         """
         super(IndependentCascadeModel, self).__init__(graph, init_seeds, record_states)
-        self.activated_nodes = set(init_seeds)
+        self.activated_mask = np.zeros(self.graph.number_of_nodes, dtype=np.uint8)
+        self.activated_mask[self._seed_indices()] = 1
+
+    @property
+    def activated_nodes(self) -> set:
+        """
+        所有已被激活的节点集合。
+
+        Returns:
+            set: 由激活标记转换得到的节点集合
+        """
+        return self._to_nodes(np.flatnonzero(self.activated_mask))
 
-    def update(self, current_activated_nodes: set):
+    def update(self, current_activated_nodes: np.ndarray):
         """
         执行一次传播更新。
 
         在当前轮次中，所有新激活的节点尝试激活它们的未激活邻居节点。
         成功激活的节点将在下一轮继续传播。
+        图的边权重为常量或WC时使用不读取逐边权重的特化内核。
 
         Args:
-            current_activated_nodes (set): 当前轮次需要尝试传播的已激活节点集合
+            current_activated_nodes (np.ndarray): 当前轮次需要尝试传播的已激活节点编号数组
 
         Returns:
-            set: 本轮新激活的节点集合
+            np.ndarray: 本轮新激活的节点编号数组
         """
-        # 执行一次传播过程
-        new_activated_nodes = set()
-        for node in current_activated_nodes:
-            for neighbor in self.graph.neighbors(node):
-                if neighbor not in self.activated_nodes:
-                    if self.graph.edges[node, neighbor]['weight'] > random.random():
-                        new_activated_nodes.add(neighbor)
-                        self.activated_nodes.add(neighbor)
+        graph = self.graph
+        if NUMBA_AVAILABLE:
+            if graph.constant_weight is not None:
+                new_activated_nodes = ic_step_const(graph.indptr, graph.indices, graph.constant_weight,
+                                                    current_activated_nodes, self.activated_mask)
+            elif graph.inv_in_degree is not None:
+                new_activated_nodes = ic_step_wc(graph.indptr, graph.indices, graph.inv_in_degree,
+                                                 current_activated_nodes, self.activated_mask)
+            else:
+                new_activated_nodes = ic_step(graph.indptr, graph.indices, graph.weights,
+                                              current_activated_nodes, self.activated_mask)
+        else:
+            new_activated_nodes = self._update_numpy(current_activated_nodes)
+
+        # 记录每轮的状态
+        if self.record_states and new_activated_nodes.size:
+            self.states.append(new_activated_nodes)
 
-        # 记录每轮的状态（应该记录所有已激活的节点）
-        if self.record_states and new_activated_nodes:
-            self.states.append(new_activated_nodes.copy())
+        return new_activated_nodes
 
+    def _update_numpy(self, current_activated_nodes: np.ndarray) -> np.ndarray:
+        """
+        未安装numba时的单轮传播实现。
+
+        前沿节点的所有出边一次性从CSR中取出，对整批边做一次伯努利采样。
+
+        Args:
+            current_activated_nodes (np.ndarray): 当前轮次需要尝试传播的已激活节点编号数组
+
+        Returns:
+            np.ndarray: 本轮新激活的节点编号数组
+        """
+        edge_ids = self._edge_ids(self.graph.indptr, current_activated_nodes)
+        total = edge_ids.size
+        if total == 0:
+            return np.empty(0, dtype=np.int32)
+
+        graph = self.graph
+        neighbors = graph.indices[edge_ids]
+        if graph.constant_weight is not None:
+            probs = graph.constant_weight
+        elif graph.inv_in_degree is not None:
+            probs = graph.inv_in_degree[neighbors]
+        else:
+            probs = graph.weights[edge_ids]
+        hit = self.rng.random(total) < probs
+        hit &= self.activated_mask[neighbors] == 0
+        new_activated_nodes = np.unique(neighbors[hit])
+        self.activated_mask[new_activated_nodes] = 1
         return new_activated_nodes
 
-    def diffusion(self, update_counts=None):
+    def diffusion(self, update_counts=None, rng: np.random.Generator = None):
         """
         执行完整的扩散过程。
 
@@ -75,23 +127,50 @@ class IndependentCascadeModel(BaseDiffusionModel):
 
         Args:
             update_counts (int, optional): 最大更新轮次数。如果为None则持续传播直到无新节点激活
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
 
         Returns:
             set: 最终所有被激活的节点集合
         """
+        self._propagate(update_counts, rng)
+        return self.activated_nodes
+
+    def _diffusion_size(self, update_counts=None, rng: np.random.Generator = None) -> int:
+        """
+        执行完整的扩散过程，只返回最终激活的节点数。
+
+        蒙特卡洛模拟只需要结果规模，直接从状态标记计数，避免每轮构造节点集合。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+
+        Returns:
+            int: 最终激活的节点数
+        """
+        self._propagate(update_counts, rng)
+        return int(np.count_nonzero(self.activated_mask))
+
+    def _propagate(self, update_counts, rng: np.random.Generator = None):
+        """
+        从初始状态开始反复调用update，直到满足停止条件。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+        """
+        if rng is not None:
+            self._use_rng(rng)
         if update_counts is not None and update_counts <= 0:
             raise ValueError("update_counts must be a positive integer.")
-        count = 0
-        current_activated_nodes = set(self.init_seeds)
-        while True:
+        current_activated_nodes = self._seed_indices()
+        for _ in range(update_counts or sys.maxsize):
             current_activated_nodes = self.update(current_activated_nodes)
-            count += 1
-            if not current_activated_nodes or (update_counts and count >= update_counts):
+            if not current_activated_nodes.size:
                 break
-        return self.activated_nodes
 
     def run_monte_carlo_diffusion(self, mc_rounds: int, update_counts: int = None, multi_process: bool = False,
-                                  processes: int = None, random_seed: int = None):
+                                  processes: int = None, random_seed: int = None, tol: float = None):
         """
         执行蒙特卡洛模拟扩散过程。
 
@@ -101,11 +180,12 @@ class IndependentCascadeModel(BaseDiffusionModel):
             multi_process (bool): 是否启用多进程模式，默认为False
             processes (int, optional): 多进程模式下的进程数，为None时使用CPU核心数
             random_seed (int, optional): 模拟时的随机种子，默认为None（每次结果不同）
+            tol (float, optional): 提前停止的相对标准误差阈值，默认为None（执行全部轮次）
 
         Returns:
             float: 所有模拟轮次的平均激活节点数
         """
-        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed)
+        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed, tol)
 
 
     def reset(self, init_seeds=None):
@@ -118,9 +198,9 @@ class IndependentCascadeModel(BaseDiffusionModel):
         Args:
             init_seeds (list, optional): 新的初始种子节点集合，若为None则使用原有种子集
         """
-        if init_seeds is None:
-            init_seeds = self.init_seeds
-        self.init_seeds = init_seeds
-        self.activated_nodes = set(init_seeds)
+        if init_seeds is not None:
+            self.init_seeds = init_seeds
+        self.activated_mask[:] = 0
+        self.activated_mask[self._seed_indices()] = 1
         if self.record_states:
-            self.states = [set(self.init_seeds)]
+            self.states = [self._seed_indices()]
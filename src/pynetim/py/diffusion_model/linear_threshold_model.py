@@ -1,8 +1,11 @@
-import random
+import sys
+
+import numpy as np
 
 from .run_monte_carlo_diffusion import run_monte_carlo_diffusion
 from ..graph import IMGraphPy
 from . import BaseDiffusionModel
+from ._kernels import NUMBA_AVAILABLE, lt_step
 
 
 class LinearThresholdModel(BaseDiffusionModel):
@@ -12,6 +15,7 @@ class LinearThresholdModel(BaseDiffusionModel):
     实现了经典的线性阈值传播模型，该模型是一种离散时间传播模型，
     每个节点都有一个随机阈值，当其已激活邻居的影响力总和超过该阈值时，
     节点被激活。每个节点对其他节点的影响力通过边权重表示。
+    阈值在每次模拟开始时抽取一次，模拟过程中保持不变。
 
     参考文献:
         - Granovetter, M. (1978). "Threshold models of collective behavior."
@@ -21,10 +25,13 @@ class LinearThresholdModel(BaseDiffusionModel):
 
     Attributes:
         activated_nodes (set): 所有已被激活的节点集合
+        activated_mask (np.ndarray): 按节点编号的激活标记，uint8
+        theta (np.ndarray): 本次模拟中各节点的激活阈值，float64
+        activated_in_sum (np.ndarray): 本次模拟中各节点已累加的来自已激活入邻居的影响力，float64
         graph (IMGraph): 表示传播网络结构（继承自BaseDiffusionModel）
         init_seeds (list): 初始种子集（继承自BaseDiffusionModel）
         record_states (bool): 指示是否记录传播过程中的状态变化（继承自BaseDiffusionModel）
-        states (list): 当record_states为True时存储传播过程的状态历史（继承自BaseDiffusionModel）
+        states (list): 当record_states为True时存储传播过程的状态历史，元素为节点编号数组（继承自BaseDiffusionModel）
     """
 
     def __init__(self, graph: IMGraphPy, init_seeds: list, record_states: bool = False):
@@ -37,43 +44,75 @@ class LinearThresholdModel(BaseDiffusionModel):
             record_states (bool): 控制是否记录每一步的状态，默认为False
         """
         super(LinearThresholdModel, self).__init__(graph, init_seeds, record_states)
-        self.activated_nodes = set(self.init_seeds)
+        self.activated_mask = np.zeros(self.graph.number_of_nodes, dtype=np.uint8)
+        self.activated_mask[self._seed_indices()] = 1
+        self.theta = np.zeros(self.graph.number_of_nodes)
+        self.activated_in_sum = np.zeros(self.graph.number_of_nodes)
+
+    @property
+    def activated_nodes(self) -> set:
+        """
+        所有已被激活的节点集合。
+
+        Returns:
+            set: 由激活标记转换得到的节点集合
+        """
+        return self._to_nodes(np.flatnonzero(self.activated_mask))
 
-    def update(self, current_activated_nodes: set):
+    def update(self, current_activated_nodes: np.ndarray):
         """
         执行一次传播更新。
 
-        在线性阈值模型中，未激活的节点检查其已激活邻居的影响力总和，
-        如果超过节点的阈值则被激活。
+        在线性阈值模型中，上一轮新激活的节点将影响力累加到其未激活的出邻居上，
+        累计影响力达到阈值的节点被激活。
 
         Args:
-            current_activated_nodes (set): 当前轮次需要尝试传播的已激活节点集合
+            current_activated_nodes (np.ndarray): 上一轮新激活的节点编号数组
 
         Returns:
-            set: 本轮新激活的节点集合
-        """
-        # 执行一次传播过程
-        new_activated_nodes = set()
-        node_theta = {node: random.random() for node in range(self.graph.number_of_nodes)}
-        influence_sum = {node: 0 for node in range(self.graph.number_of_nodes)}
-        for node in current_activated_nodes:
-            for neighbor in self.graph.neighbors(node):
-                if neighbor not in self.activated_nodes:
-                    influence_sum[neighbor] += self.graph.edges[node, neighbor]['weight']
-                    # in_neighbors = self.graph.in_neighbors(neighbor)
-                    # sum_weights = sum(self.graph.edges[in_neighbor, neighbor]['weight']
-                    #                   for in_neighbor in in_neighbors
-                    #                   if in_neighbor in current_activated_nodes)
-                    if influence_sum[neighbor] >= node_theta[neighbor]:
-                        new_activated_nodes.add(neighbor)
-                        self.activated_nodes.add(neighbor)
+            np.ndarray: 本轮新激活的节点编号数组
+        """
+        graph = self.graph
+        if NUMBA_AVAILABLE:
+            new_activated_nodes = lt_step(graph.indptr, graph.indices, graph.weights, current_activated_nodes,
+                                          self.activated_mask, self.activated_in_sum, self.theta)
+        else:
+            new_activated_nodes = self._update_numpy(current_activated_nodes)
+
         # 记录每轮的状态
-        if self.record_states and new_activated_nodes:
-            self.states.append(new_activated_nodes.copy())
+        if self.record_states and new_activated_nodes.size:
+            self.states.append(new_activated_nodes)
 
         return new_activated_nodes
 
-    def diffusion(self, update_counts: int = None):
+    def _update_numpy(self, current_activated_nodes: np.ndarray) -> np.ndarray:
+        """
+        未安装numba时的单轮传播实现。
+
+        前沿节点指向未激活节点的所有出边一次性从CSR中取出，按目标节点累加影响力，
+        再只对被触及的节点与阈值比较。
+
+        Args:
+            current_activated_nodes (np.ndarray): 上一轮新激活的节点编号数组
+
+        Returns:
+            np.ndarray: 本轮新激活的节点编号数组
+        """
+        graph = self.graph
+        edge_ids = self._edge_ids(graph.indptr, current_activated_nodes)
+        neighbors = graph.indices[edge_ids]
+        inactive = self.activated_mask[neighbors] == 0
+        neighbors = neighbors[inactive]
+        if neighbors.size == 0:
+            return neighbors
+
+        np.add.at(self.activated_in_sum, neighbors, graph.weights[edge_ids[inactive]])
+        candidates = np.unique(neighbors)
+        new_activated_nodes = candidates[self.activated_in_sum[candidates] >= self.theta[candidates]]
+        self.activated_mask[new_activated_nodes] = 1
+        return new_activated_nodes
+
+    def diffusion(self, update_counts: int = None, rng: np.random.Generator = None):
         """
         执行完整的扩散过程。
 
@@ -81,23 +120,53 @@ class LinearThresholdModel(BaseDiffusionModel):
 
         Args:
             update_counts (int, optional): 最大更新轮次数。如果为None则持续传播直到无新节点激活
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
 
         Returns:
             set: 最终所有被激活的节点集合
         """
+        self._propagate(update_counts, rng)
+        return self.activated_nodes
+
+    def _diffusion_size(self, update_counts=None, rng: np.random.Generator = None) -> int:
+        """
+        执行完整的扩散过程，只返回最终激活的节点数。
+
+        蒙特卡洛模拟只需要结果规模，直接从状态标记计数，避免每轮构造节点集合。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+
+        Returns:
+            int: 最终激活的节点数
+        """
+        self._propagate(update_counts, rng)
+        return int(np.count_nonzero(self.activated_mask))
+
+    def _propagate(self, update_counts, rng: np.random.Generator = None):
+        """
+        从初始状态开始反复调用update，直到满足停止条件。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+        """
+        if rng is not None:
+            self._use_rng(rng)
         if update_counts is not None and update_counts <= 0:
             raise ValueError("update_counts must be a positive integer.")
-        count = 0
-        current_activated_nodes = set(self.init_seeds)
-        while True:
+        # 每次模拟重新抽取阈值并清空累计影响力
+        self.theta = self.rng.random(self.graph.number_of_nodes)
+        self.activated_in_sum[:] = 0
+        current_activated_nodes = self._seed_indices()
+        for _ in range(update_counts or sys.maxsize):
             current_activated_nodes = self.update(current_activated_nodes)
-            count += 1
-            if not current_activated_nodes or (update_counts and count >= update_counts):
+            if not current_activated_nodes.size:
                 break
-        return self.activated_nodes
 
     def run_monte_carlo_diffusion(self, mc_rounds: int, update_counts: int = None, multi_process: bool = False,
-                                  processes: int = None, random_seed: int = None):
+                                  processes: int = None, random_seed: int = None, tol: float = None):
         """
         执行蒙特卡洛模拟扩散过程。
 
@@ -107,11 +176,12 @@ class LinearThresholdModel(BaseDiffusionModel):
             multi_process (bool): 是否启用多进程模式，默认为False
             processes (int, optional): 多进程模式下的进程数，为None时使用CPU核心数
             random_seed (int, optional): 随机种子，默认为None（每次结果不同）
+            tol (float, optional): 提前停止的相对标准误差阈值，默认为None（执行全部轮次）
 
         Returns:
             float: 所有模拟轮次的平均激活节点数
         """
-        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed)
+        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed, tol)
 
 
     def reset(self, init_seeds=None):
@@ -124,9 +194,9 @@ class LinearThresholdModel(BaseDiffusionModel):
         Args:
             init_seeds (list, optional): 新的初始种子节点集合，若为None则使用原有种子集
         """
-        if init_seeds is None:
-            init_seeds = self.init_seeds
-        self.init_seeds = init_seeds
-        self.activated_nodes = set(init_seeds)
+        if init_seeds is not None:
+            self.init_seeds = init_seeds
+        self.activated_mask[:] = 0
+        self.activated_mask[self._seed_indices()] = 1
         if self.record_states:
-            self.states = [set(self.init_seeds)]
+            self.states = [self._seed_indices()]
@@ -1,30 +1,227 @@
-import random
+import atexit
+import copy
+import math
+import numbers
+import weakref
+from dataclasses import dataclass
 from multiprocessing import Pool, cpu_count
-import statistics
 
+import numpy as np
+
+from ._cuda import batched_ic_cuda
 from .base_diffusion_model import BaseDiffusionModel
+from ..graph.graph import IMGraphPy, SCIPY_AVAILABLE
+
+# 多进程模式复用的进程池及其对应的模型、图与进程数；模型与图只保存弱引用，
+# 不延长它们的生命周期，模型被回收时由终结器关闭进程池
+_POOL = None
+_POOL_MODEL = None
+_POOL_GRAPH = None
+_POOL_PROCESSES = None
+# 进程池使用的CSR共享内存块，关闭进程池时释放
+_POOL_SHARED = []
+# 工作进程内由初始化函数设置的模型副本
+_WORKER_MODEL = None
+# 提前停止前至少需要完成的模拟轮数，轮数过少时标准误差估计不可靠
+_MIN_STOP_ROUNDS = 30
+# 多进程模式启用提前停止时，总轮数最多分成的批次数
+_STOP_WAVES = 10
+
+
+@dataclass
+class _OnlineStats:
+    """
+    Welford在线均值与方差累加器。
+
+    Attributes:
+        n (int): 已累加的样本数
+        mean (float): 当前均值
+        m2 (float): 与均值之差的平方和
+    """
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def push(self, x: float):
+        """
+        累加一个样本。
+
+        Args:
+            x (float): 样本值
+        """
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: '_OnlineStats'):
+        """
+        合并另一个累加器的结果。
+
+        Args:
+            other (_OnlineStats): 另一组样本的累加器
+        """
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    @property
+    def sem(self) -> float:
+        """
+        均值的标准误差，样本数不足2时为无穷大。
+        """
+        if self.n < 2:
+            return math.inf
+        return math.sqrt(self.m2 / (self.n - 1) / self.n)
+
+    def converged(self, tol: float) -> bool:
+        """
+        判断标准误差是否已小于均值的tol倍。
+
+        Args:
+            tol (float): 相对容差
+
+        Returns:
+            bool: 是否可以停止模拟
+        """
+        return self.n >= _MIN_STOP_ROUNDS and self.sem <= tol * self.mean
 
 
-def __simulate_multi_round(diffusion_model: BaseDiffusionModel, mc_rounds: int, update_counts: int = None, random_seed: int = None):
+def __simulate_rounds(diffusion_model: BaseDiffusionModel, mc_rounds: int, update_counts: int,
+                      seed_seq: np.random.SeedSequence):
     """
-    在单个进程中执行多轮蒙特卡洛模拟。
+    在单个进程中执行多轮蒙特卡洛模拟，逐轮产出激活节点数。
+
+    所有轮次共用由seed_seq生成的同一个随机流，Numba内核只在开始时播种一次。
 
     Args:
         diffusion_model (BaseDiffusionModel): 扩散模型实例
         mc_rounds (int): 该进程需要执行的模拟轮数
-        update_counts (int, optional): 更新轮次数，适用于SI/SIR等模型
-        random_seed (int, optional): 随机种子的基础值，默认为None
+        update_counts (int): 更新轮次数，适用于SI/SIR等模型，可以为None
+        seed_seq (np.random.SeedSequence): 派生各轮随机流的种子序列
 
-    Returns:
-        float: 该进程所有模拟轮次的平均激活节点数
+    Yields:
+        int: 每轮模拟的激活节点数
     """
-    count = 0
-    for i in range(mc_rounds):
-        random.seed(random_seed + i if random_seed is not None else None)
+    rng = np.random.default_rng(seed_seq)
+    for _ in range(mc_rounds):
         diffusion_model.reset()
-        result = diffusion_model.diffusion(update_counts)
-        count += len(result)
-    return count / mc_rounds
+        yield diffusion_model._diffusion_size(update_counts, rng)
+
+
+def _init_worker(diffusion_model: BaseDiffusionModel, graph_meta: dict):
+    """
+    进程池初始化函数，在每个工作进程中保存一份模型。
+
+    传入的模型不含图对象，图由共享内存中的CSR数组重建。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): 不含图对象的扩散模型副本
+        graph_meta (dict): IMGraphPy.to_shared 返回的描述信息
+    """
+    global _WORKER_MODEL
+    diffusion_model.graph = IMGraphPy.from_shared(graph_meta)
+    _WORKER_MODEL = diffusion_model
+
+
+def _model_params(diffusion_model: BaseDiffusionModel) -> dict:
+    """
+    取出模型的公开标量参数（如beta、gamma），随每个任务传给工作进程。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): 扩散模型实例
+
+    Returns:
+        dict: 属性名到取值的映射
+    """
+    return {name: value for name, value in vars(diffusion_model).items()
+            if not name.startswith('_') and isinstance(value, (numbers.Number, str))}
+
+
+def _worker_run(args):
+    """
+    工作进程任务：以给定种子集与模型参数执行多轮模拟。
+
+    Args:
+        args (tuple): (init_seeds, params, mc_rounds, update_counts, seed_seq)
+
+    Returns:
+        _OnlineStats: 该任务所有模拟轮次激活节点数的统计量
+    """
+    init_seeds, params, mc_rounds, update_counts, seed_seq = args
+    # 进程池在多次调用之间复用，参数以本次调用时主进程中的取值为准
+    vars(_WORKER_MODEL).update(params)
+    _WORKER_MODEL.reset(init_seeds)
+    stats = _OnlineStats()
+    for size in __simulate_rounds(_WORKER_MODEL, mc_rounds, update_counts, seed_seq):
+        stats.push(size)
+    return stats
+
+
+def _get_pool(diffusion_model: BaseDiffusionModel, processes: int) -> Pool:
+    """
+    获取与模型对应的进程池。
+
+    同一模型对象以相同的图和进程数再次调用时直接复用已有进程池。创建进程池时图的CSR数组
+    放入共享内存，工作进程直接映射使用，模型本身不含图对象传入；之后每个任务只传种子集、
+    模型的标量参数和轮数。模型、图或进程数变化时重建进程池。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): 扩散模型实例
+        processes (int): 进程数
+
+    Returns:
+        Pool: 可用的进程池
+    """
+    global _POOL, _POOL_MODEL, _POOL_GRAPH, _POOL_PROCESSES, _POOL_SHARED
+    if (_POOL is None or _POOL_MODEL() is not diffusion_model or _POOL_GRAPH() is not diffusion_model.graph
+            or _POOL_PROCESSES != processes):
+        _close_pool()
+        graph_meta, _POOL_SHARED = diffusion_model.graph.to_shared()
+        worker_model = copy.copy(diffusion_model)
+        worker_model.graph = None
+        _POOL = Pool(processes=processes, initializer=_init_worker, initargs=(worker_model, graph_meta))
+        _POOL_MODEL = weakref.ref(diffusion_model)
+        _POOL_GRAPH = weakref.ref(diffusion_model.graph)
+        _POOL_PROCESSES = processes
+        weakref.finalize(diffusion_model, _release_pool, _POOL_MODEL)
+    return _POOL
+
+
+def _release_pool(model_ref: weakref.ref):
+    """
+    模型被回收时的终结器：进程池仍属于该模型时将其关闭。
+
+    Args:
+        model_ref (weakref.ref): 创建进程池时记录的模型弱引用
+    """
+    if _POOL_MODEL is model_ref:
+        _close_pool()
+
+
+def _close_pool():
+    """
+    关闭复用的进程池并释放共享内存。
+    """
+    global _POOL, _POOL_MODEL, _POOL_GRAPH, _POOL_PROCESSES, _POOL_SHARED
+    if _POOL is not None:
+        _POOL.close()
+        _POOL.join()
+    for shm in _POOL_SHARED:
+        shm.close()
+        shm.unlink()
+    _POOL_SHARED = []
+    _POOL = None
+    _POOL_MODEL = None
+    _POOL_GRAPH = None
+    _POOL_PROCESSES = None
+
+
+atexit.register(_close_pool)
 
 
 def run_monte_carlo_diffusion(
@@ -34,17 +231,28 @@ def run_monte_carlo_diffusion(
         multi_process: bool = False,
         processes: int = None,
         random_seed: int = None,
+        tol: float = None,
 ):
     """
     执行蒙特卡洛模拟扩散过程，支持单进程和多进程模式。
 
+    多进程模式下进程池在对同一模型对象的多次调用之间复用，种子集和模型的标量参数（如beta）
+    随每次调用传给工作进程；模型被回收后进程池随之关闭。
+
+    所有随机流都由 SeedSequence(random_seed) 派生：单进程模式下所有轮次共用一个随机流，
+    多进程模式下每个任务一个子流，任务内各轮依次使用。
+
+    设置tol时，激活节点数均值的标准误差小于均值的tol倍即提前停止，此时实际模拟轮数
+    可能少于mc_rounds。多进程模式下模拟分批提交，每批结束后检查一次。
+
     Args:
         diffusion_model (BaseDiffusionModel): 扩散模型实例
         mc_rounds (int): 蒙特卡洛模拟总轮数
         update_counts (int, optional): 更新轮次数，适用于SI等模型
         multi_process (bool, optional): 是否启用多进程模式，默认为False
         processes (int, optional): 多进程模式下的进程数，为None时使用CPU核心数
-        random_seed (int, optional): 随机种子的基础值，默认为None
+        random_seed (int, optional): 随机种子，默认为None
+        tol (float, optional): 提前停止的相对标准误差阈值，默认为None（执行全部轮次）
 
     Returns:
         float: 所有模拟轮次的平均激活节点数
@@ -52,23 +260,182 @@ def run_monte_carlo_diffusion(
     if mc_rounds <= 0:
         raise ValueError("蒙特卡洛模拟轮数(mc_rounds)必须大于0")
 
+    seed_seq = np.random.SeedSequence(random_seed)
+    stats = _OnlineStats()
     if multi_process:
         if processes is None:
             processes = cpu_count()
+        pool = _get_pool(diffusion_model, processes)
+        params = _model_params(diffusion_model)
 
-        # 每个进程执行 mc_rounds / processes 次模拟
-        rounds_per_worker = int(mc_rounds / processes)
-        with Pool(processes=processes) as pool:
-            # 每个进程需要的参数
-            args = [
-                (diffusion_model, rounds_per_worker, update_counts, random_seed + i * rounds_per_worker if random_seed is not None else None)
-                for i in range(processes)
-            ]
-            results = pool.starmap(__simulate_multi_round, args)
-
-        avg_activated = statistics.mean(results)
+        # 不提前停止时一次提交全部轮次，否则分批提交
+        wave = mc_rounds if tol is None else max(processes, -(-mc_rounds // _STOP_WAVES))
+        offset = 0
+        while offset < mc_rounds:
+            # 将本批轮数尽量均分给各进程，余数分给前几个进程
+            base, extra = divmod(min(wave, mc_rounds - offset), processes)
+            args = []
+            for i in range(processes):
+                rounds = base + (1 if i < extra else 0)
+                if rounds == 0:
+                    break
+                args.append((diffusion_model.init_seeds, params, rounds, update_counts, seed_seq.spawn(1)[0]))
+                offset += rounds
+            for worker_stats in pool.imap(_worker_run, args):
+                stats.merge(worker_stats)
+            if tol is not None and stats.converged(tol):
+                break
     else:
         # 单进程模式
-        avg_activated = __simulate_multi_round(diffusion_model, mc_rounds, update_counts, random_seed)
+        for size in __simulate_rounds(diffusion_model, mc_rounds, update_counts, seed_seq):
+            stats.push(size)
+            if tol is not None and stats.converged(tol):
+                break
+
+    return stats.mean
+
+
+def _reach_by_edges(graph, frontier, frontier_nodes, rng):
+    """
+    批量IC的单轮传播：对前沿节点的每条出边在每一列各做一次伯努利采样。
+
+    Args:
+        graph (IMGraphPy): 图对象
+        frontier (np.ndarray): 形状为 (n, batch) 的前沿标记
+        frontier_nodes (np.ndarray): 至少在一列处于前沿的节点编号
+        rng (np.random.Generator): 随机数生成器
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 被触及的节点编号及其形状为 (len, batch) 的命中标记
+    """
+    edge_ids = BaseDiffusionModel._edge_ids(graph.indptr, frontier_nodes)
+    sources = np.repeat(frontier_nodes, graph.indptr[frontier_nodes + 1] - graph.indptr[frontier_nodes])
+    targets = graph.indices[edge_ids]
+
+    fired = rng.random((edge_ids.size, frontier.shape[1])) < graph.weights[edge_ids, None]
+    fired &= frontier[sources]
+
+    # 按目标节点分组，对同一目标的所有入边按列取或
+    order = np.argsort(targets, kind='stable')
+    targets = targets[order]
+    boundaries = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+    return targets[boundaries], np.logical_or.reduceat(fired[order], boundaries, axis=0)
+
+
+def _reach_by_spmv(log_fail, certain, frontier, frontier_nodes, rng):
+    """
+    批量IC的单轮传播：用稀疏矩阵乘法按节点合并各条入边的激活概率。
+
+    节点v在某一列未被激活的概率为该列所有前沿入邻居u的 (1 - w(u, v)) 之积，
+    取对数后即为 log(1 - W) 的转置与前沿矩阵的乘积。每个被触及节点在每一列只需一个随机数。
+    权重不小于1的边单独用计数矩阵处理，避免对数为负无穷。
+
+    Args:
+        log_fail (scipy.sparse.csr_matrix): 元素为 log(1 - w) 的邻接矩阵
+        certain (scipy.sparse.csr_matrix): 权重不小于1的边的指示矩阵
+        frontier (np.ndarray): 形状为 (n, batch) 的前沿标记
+        frontier_nodes (np.ndarray): 至少在一列处于前沿的节点编号
+        rng (np.random.Generator): 随机数生成器
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 被触及的节点编号及其形状为 (len, batch) 的命中标记
+    """
+    rows = log_fail[frontier_nodes]
+    targets = np.unique(rows.indices)
+    active = frontier[frontier_nodes].astype(np.float64)
+
+    log_survive = rows[:, targets].T @ active
+    reached = rng.random(log_survive.shape) >= np.exp(log_survive)
+    reached |= (certain[frontier_nodes][:, targets].T @ active) > 0
+    return targets, reached
+
+
+def run_monte_carlo_diffusion_batched(
+        diffusion_model: BaseDiffusionModel,
+        mc_rounds: int,
+        batch: int = 64,
+        update_counts: int = None,
+        random_seed: int = None,
+        device: str = 'cpu',
+):
+    """
+    以批量方式执行IC模型的蒙特卡洛模拟。
+
+    每批同时推进 batch 次独立模拟：节点状态为形状 (n, batch) 的布尔矩阵，每一列对应一次模拟。
+    安装scipy时每轮以稀疏矩阵乘法按节点合并前沿入边的激活概率；
+    否则取出所有列前沿节点的出边，对 (边数, batch) 个随机数做一次比较后按目标节点归并。
+    device 为 'cuda' 时改用CuPy在GPU上按边归并，适合节点数与 batch 都较大的情形。
+
+    Args:
+        diffusion_model (BaseDiffusionModel): IC模型实例
+        mc_rounds (int): 蒙特卡洛模拟总轮数
+        batch (int, optional): 每批并行推进的模拟次数，默认为64
+        update_counts (int, optional): 每次模拟的最大传播轮次
+        random_seed (int, optional): 随机种子，默认为None
+        device (str, optional): 计算设备，'cpu' 或 'cuda'，默认为 'cpu'
+
+    Returns:
+        float: 所有模拟轮次的平均激活节点数
+
+    Raises:
+        ImportError: device 为 'cuda' 但未安装cupy时抛出
+    """
+    from .independent_cascade_model import IndependentCascadeModel
+
+    if not isinstance(diffusion_model, IndependentCascadeModel):
+        raise TypeError("批量蒙特卡洛模拟目前仅支持IndependentCascadeModel")
+    if mc_rounds <= 0:
+        raise ValueError("蒙特卡洛模拟轮数(mc_rounds)必须大于0")
+    if batch <= 0:
+        raise ValueError("batch必须大于0")
+    if update_counts is not None and update_counts <= 0:
+        raise ValueError("update_counts must be a positive integer.")
+    if device not in ('cpu', 'cuda'):
+        raise ValueError("device必须为 'cpu' 或 'cuda'")
+
+    graph = diffusion_model.graph
+    n = graph.number_of_nodes
+    seeds = diffusion_model._seed_indices()
+    if device == 'cuda':
+        return batched_ic_cuda(graph, seeds, mc_rounds, batch, update_counts, random_seed)
+    rng = np.random.default_rng(random_seed)
+
+    if SCIPY_AVAILABLE:
+        adjacency = graph.adjacency_matrix
+        # 权重不小于1的边必然激活，由certain单独处理，只对其余的边取对数
+        uncertain = adjacency.data < 1
+        log_fail = adjacency.copy()
+        log_fail.data = np.zeros(adjacency.data.shape, dtype=np.float64)
+        log_fail.data[uncertain] = np.log1p(-adjacency.data[uncertain].astype(np.float64))
+        certain = adjacency.copy()
+        certain.data = (adjacency.data >= 1).astype(np.float64)
+
+    total = 0
+    for start in range(0, mc_rounds, batch):
+        width = min(batch, mc_rounds - start)
+        activated = np.zeros((n, width), dtype=bool)
+        activated[seeds] = True
+        frontier = activated.copy()
+
+        count = 0
+        while True:
+            frontier_nodes = np.flatnonzero(frontier.any(axis=1))
+            if frontier_nodes.size == 0:
+                break
+            if SCIPY_AVAILABLE:
+                reached_nodes, reached = _reach_by_spmv(log_fail, certain, frontier, frontier_nodes, rng)
+            else:
+                reached_nodes, reached = _reach_by_edges(graph, frontier, frontier_nodes, rng)
+            reached &= ~activated[reached_nodes]
+
+            activated[reached_nodes] |= reached
+            frontier[:] = False
+            frontier[reached_nodes] = reached
+
+            count += 1
+            if update_counts and count >= update_counts:
+                break
+
+        total += int(activated.sum())
 
-    return avg_activated
+    return total / mc_rounds
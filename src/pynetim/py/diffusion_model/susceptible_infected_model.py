@@ -1,9 +1,11 @@
-import random
+import sys
+
+import numpy as np
 
 from .base_diffusion_model import BaseDiffusionModel
 from .run_monte_carlo_diffusion import run_monte_carlo_diffusion
 from ..graph import IMGraphPy
-from .._utils import infection_threshold
+from ._kernels import NUMBA_AVAILABLE, si_step
 
 
 class SusceptibleInfectedModel(BaseDiffusionModel):
@@ -22,10 +24,11 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
 
     Attributes:
         infected_nodes (set): 所有已被感染的节点集合
+        infected_mask (np.ndarray): 按节点编号的感染标记，uint8
         graph (IMGraph): 表示传播网络结构（继承自BaseDiffusionModel）
         init_seeds (list): 初始感染节点集（继承自BaseDiffusionModel）
         record_states (bool): 指示是否记录传播过程中的状态变化（继承自BaseDiffusionModel）
-        states (list): 当record_states为True时存储传播过程的状态历史（继承自BaseDiffusionModel）
+        states (list): 当record_states为True时存储传播过程的状态历史，元素为节点编号数组（继承自BaseDiffusionModel）
         beta (float): 感染概率
     """
 
@@ -40,12 +43,37 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
             record_states (bool): 控制是否记录每一步的状态，默认为False
         """
         super(SusceptibleInfectedModel, self).__init__(graph, init_seeds, record_states)
-        self.infected_nodes = set(init_seeds)
+        n = self.graph.number_of_nodes
+        self.infected_mask = np.zeros(n, dtype=np.uint8)
+        # 已感染节点的编号列表，前 _num_infected 项有效
+        self._order = np.empty(n, dtype=np.int32)
+        self._num_infected = 0
+        self._reset_infected()
         if beta is None:
-            self.beta = infection_threshold(self.graph.nx_graph)
+            self.beta = self.graph.infection_threshold
         else:
             self.beta = beta
 
+    @property
+    def infected_nodes(self) -> set:
+        """
+        所有已被感染的节点集合。
+
+        Returns:
+            set: 由已感染节点列表转换得到的节点集合
+        """
+        return self._to_nodes(self._order[:self._num_infected])
+
+    def _reset_infected(self):
+        """
+        将感染状态恢复为仅初始种子被感染。
+        """
+        seeds = self._seed_indices()
+        self.infected_mask[:] = 0
+        self.infected_mask[seeds] = 1
+        self._order[:seeds.size] = seeds
+        self._num_infected = seeds.size
+
     def update(self):
         """
         执行一次传播更新。
@@ -54,25 +82,43 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
         成功感染的节点将在后续所有轮次中继续传播。
 
         Returns:
-            set: 本轮新感染的节点集合
-        """
-        # 执行一次传播过程
-        new_infected_nodes = set()
-        # 遍历所有已感染的节点，而不是仅当前轮次新感染的节点
-        for node in self.infected_nodes:
-            for neighbor in self.graph.neighbors(node):
-                if neighbor not in self.infected_nodes:
-                    if self.beta > random.random():
-                        new_infected_nodes.add(neighbor)
-
-        self.infected_nodes.update(new_infected_nodes)
+            np.ndarray: 本轮新感染的节点编号数组
+        """
+        graph = self.graph
+        start = self._num_infected
+        if NUMBA_AVAILABLE:
+            self._num_infected = si_step(graph.indptr, graph.indices, self.infected_mask, self._order,
+                                         start, self.beta)
+        else:
+            self._num_infected = self._update_numpy()
+        new_infected_nodes = self._order[start:self._num_infected].copy()
+
         # 记录每轮的状态
-        if self.record_states and new_infected_nodes:
-            self.states.append(new_infected_nodes.copy())
+        if self.record_states and new_infected_nodes.size:
+            self.states.append(new_infected_nodes)
 
         return new_infected_nodes
 
-    def diffusion(self, update_counts):
+    def _update_numpy(self) -> int:
+        """
+        未安装numba时的单轮传播实现。
+
+        一次性取出全部已感染节点的出边做伯努利采样，新感染节点追加到已感染节点列表之后。
+
+        Returns:
+            int: 本轮结束时的已感染节点数
+        """
+        graph = self.graph
+        count = self._num_infected
+        neighbors = graph.indices[self._edge_ids(graph.indptr, self._order[:count])]
+        hit = self.rng.random(neighbors.size) < self.beta
+        hit &= self.infected_mask[neighbors] == 0
+        new_infected_nodes = np.unique(neighbors[hit])
+        self.infected_mask[new_infected_nodes] = 1
+        self._order[count:count + new_infected_nodes.size] = new_infected_nodes
+        return count + new_infected_nodes.size
+
+    def diffusion(self, update_counts, rng: np.random.Generator = None):
         """
         执行完整的扩散过程。
 
@@ -80,22 +126,50 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
 
         Args:
             update_counts (int): 最大更新轮次数。
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
 
         Returns:
             set: 最终所有被感染的节点集合
         """
+        self._propagate(update_counts, rng)
+        return self.infected_nodes
+
+    def _diffusion_size(self, update_counts, rng: np.random.Generator = None) -> int:
+        """
+        执行完整的扩散过程，只返回最终感染的节点数。
+
+        蒙特卡洛模拟只需要结果规模，直接从状态标记计数，避免每轮构造节点集合。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+
+        Returns:
+            int: 最终感染的节点数
+        """
+        self._propagate(update_counts, rng)
+        return self._num_infected
+
+    def _propagate(self, update_counts, rng: np.random.Generator = None):
+        """
+        从初始状态开始反复调用update，直到满足停止条件。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+        """
+        if rng is not None:
+            self._use_rng(rng)
         if update_counts is not None and update_counts <= 0:
             raise ValueError("update_counts must be a positive integer.")
-        count = 0
-        while True:
-            _ = self.update()
-            count += 1
-            if (len(self.infected_nodes) == self.graph.number_of_nodes) or (update_counts and count >= update_counts):
+        number_of_nodes = self.graph.number_of_nodes
+        for _ in range(update_counts or sys.maxsize):
+            self.update()
+            if self._num_infected == number_of_nodes:
                 break
-        return self.infected_nodes
 
     def run_monte_carlo_diffusion(self, mc_rounds: int, update_counts: int, multi_process: bool = False,
-                                  processes: int = None, random_seed: int = None):
+                                  processes: int = None, random_seed: int = None, tol: float = None):
         """
         执行蒙特卡洛模拟扩散过程。
 
@@ -105,11 +179,12 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
             multi_process (bool): 是否启用多进程模式，默认为False
             processes (int, optional): 多进程模式下的进程数，为None时使用CPU核心数
             random_seed (int, optional): 随机种子，默认为None（每次结果不同）
+            tol (float, optional): 提前停止的相对标准误差阈值，默认为None（执行全部轮次）
 
         Returns:
             float: 所有模拟轮次的平均激活节点数
         """
-        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed)
+        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed, tol)
 
 
     def reset(self, init_seeds=None):
@@ -122,9 +197,8 @@ class SusceptibleInfectedModel(BaseDiffusionModel):
         Args:
             init_seeds (list, optional): 新的初始感染节点集合，若为None则使用原有种子集
         """
-        if init_seeds is None:
-            init_seeds = self.init_seeds
-        self.init_seeds = init_seeds
-        self.infected_nodes = set(init_seeds)
+        if init_seeds is not None:
+            self.init_seeds = init_seeds
+        self._reset_infected()
         if self.record_states:
-            self.states = [set(self.init_seeds)]
+            self.states = [self._seed_indices()]
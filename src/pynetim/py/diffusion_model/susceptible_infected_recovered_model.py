@@ -1,9 +1,11 @@
-import random
+import sys
+
+import numpy as np
 
 from .run_monte_carlo_diffusion import run_monte_carlo_diffusion
 from ..graph import IMGraphPy
 from .base_diffusion_model import BaseDiffusionModel
-from .._utils import infection_threshold
+from ._kernels import NUMBA_AVAILABLE, sir_step
 
 
 class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
@@ -23,10 +25,12 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
     Attributes:
         infected_nodes (set): 所有已被感染的节点集合
         recovered_nodes (set): 所有已康复的节点集合
+        infected_mask (np.ndarray): 按节点编号的感染标记，uint8
+        recovered_mask (np.ndarray): 按节点编号的康复标记，uint8
         graph (IMGraph): 表示传播网络结构（继承自BaseDiffusionModel）
         init_seeds (list): 初始感染节点集（继承自BaseDiffusionModel）
         record_states (bool): 指示是否记录传播过程中的状态变化（继承自BaseDiffusionModel）
-        states (list): 当record_states为True时存储传播过程的状态历史（继承自BaseDiffusionModel）
+        states (list): 当record_states为True时存储传播过程的状态历史，元素为节点编号数组（继承自BaseDiffusionModel）
         gamma (float): 康复率
         beta (float): 感染率
     """
@@ -44,14 +48,52 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
             record_states (bool): 控制是否记录每一步的状态，默认为False
         """
         super(SusceptibleInfectedRecoveredModel, self).__init__(graph, init_seeds, record_states)
-        self.infected_nodes = set(init_seeds)
-        self.recovered_nodes = set()
+        n = self.graph.number_of_nodes
+        self.infected_mask = np.zeros(n, dtype=np.uint8)
+        self.recovered_mask = np.zeros(n, dtype=np.uint8)
+        # 感染节点的编号列表，前 _num_infected 项有效
+        self._order = np.empty(n, dtype=np.int32)
+        self._num_infected = 0
+        # 内核写回本轮康复节点的缓冲区
+        self._recovered_buf = np.empty(n, dtype=np.int32)
+        self._reset_infected()
         self.gamma = gamma
         if beta is None:
-            self.beta = infection_threshold(self.graph.nx_graph)
+            self.beta = self.graph.infection_threshold
         else:
             self.beta = beta
 
+    @property
+    def infected_nodes(self) -> set:
+        """
+        所有处于感染状态的节点集合。
+
+        Returns:
+            set: 由感染节点列表转换得到的节点集合
+        """
+        return self._to_nodes(self._order[:self._num_infected])
+
+    @property
+    def recovered_nodes(self) -> set:
+        """
+        所有已康复的节点集合。
+
+        Returns:
+            set: 由康复标记转换得到的节点集合
+        """
+        return self._to_nodes(np.flatnonzero(self.recovered_mask))
+
+    def _reset_infected(self):
+        """
+        将状态恢复为仅初始种子被感染、没有康复节点。
+        """
+        seeds = self._seed_indices()
+        self.infected_mask[:] = 0
+        self.infected_mask[seeds] = 1
+        self.recovered_mask[:] = 0
+        self._order[:seeds.size] = seeds
+        self._num_infected = seeds.size
+
     def update(self):
         """
         执行一次传播更新。
@@ -59,38 +101,56 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
         在当前轮次中，先处理感染节点的康复，然后已感染的节点尝试感染它们的易感邻居节点。
 
         Returns:
-            set: 本轮新感染的节点集合
-        """
-        # 先执行恢复过程 - 所有感染节点都有一定概率康复
-        new_recovered_nodes = set()
-        for node in self.infected_nodes:
-            if random.random() < self.gamma:
-                new_recovered_nodes.add(node)
-                self.recovered_nodes.add(node)
-
-        # 从感染节点集合中移除已康复的节点
-        self.infected_nodes -= new_recovered_nodes
-
-        # 再执行感染过程 - 所有当前感染节点尝试感染邻居
-        new_infected_nodes = set()
-        for node in list(self.infected_nodes):  # 使用list复制避免在迭代时修改集合
-            for neighbor in self.graph.neighbors(node):
-                # 只有易感节点（既未感染也未康复）才能被感染
-                if neighbor not in self.infected_nodes and neighbor not in self.recovered_nodes:
-                    if random.random() < self.beta:  # 使用beta作为感染概率
-                        new_infected_nodes.add(neighbor)
-
-        self.infected_nodes.update(new_infected_nodes)
+            np.ndarray: 本轮新感染的节点编号数组
+        """
+        graph = self.graph
+        if NUMBA_AVAILABLE:
+            kept, self._num_infected, num_recovered = sir_step(
+                graph.indptr, graph.indices, self.infected_mask, self.recovered_mask, self._order,
+                self._num_infected, self._recovered_buf, self.beta, self.gamma)
+        else:
+            kept, self._num_infected, num_recovered = self._update_numpy()
+        new_infected_nodes = self._order[kept:self._num_infected].copy()
+
         # 记录每轮的状态
-        if self.record_states and (new_infected_nodes or new_recovered_nodes):
+        if self.record_states and (new_infected_nodes.size or num_recovered):
             self.states.append({
-                'newly_infected': new_infected_nodes.copy(),
-                'newly_recovered': new_recovered_nodes.copy()
+                'newly_infected': new_infected_nodes,
+                'newly_recovered': self._recovered_buf[:num_recovered].copy()
             })
 
         return new_infected_nodes
 
-    def diffusion(self, update_counts=None):
+    def _update_numpy(self):
+        """
+        未安装numba时的单轮传播实现。
+
+        康复过程对全部感染节点一次性抽取随机数，感染过程一次性取出剩余感染节点的所有出边
+        做伯努利采样，结果写回与内核相同的缓冲区。
+
+        Returns:
+            Tuple[int, int, int]: 康复后剩余的感染节点数、本轮结束时的感染节点数、本轮康复的节点数
+        """
+        graph = self.graph
+        infected = self._order[:self._num_infected]
+        recover = self.rng.random(infected.size) < self.gamma
+        recovered_nodes = infected[recover]
+        still_infected = infected[~recover]
+        self.infected_mask[recovered_nodes] = 0
+        self.recovered_mask[recovered_nodes] = 1
+        self._recovered_buf[:recovered_nodes.size] = recovered_nodes
+        kept = still_infected.size
+        self._order[:kept] = still_infected
+
+        neighbors = graph.indices[self._edge_ids(graph.indptr, still_infected)]
+        hit = self.rng.random(neighbors.size) < self.beta
+        hit &= (self.infected_mask[neighbors] == 0) & (self.recovered_mask[neighbors] == 0)
+        new_infected_nodes = np.unique(neighbors[hit])
+        self.infected_mask[new_infected_nodes] = 1
+        self._order[kept:kept + new_infected_nodes.size] = new_infected_nodes
+        return kept, kept + new_infected_nodes.size, recovered_nodes.size
+
+    def diffusion(self, update_counts=None, rng: np.random.Generator = None):
         """
         执行完整的扩散过程。
 
@@ -98,6 +158,7 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
 
         Args:
             update_counts (int, optional): 最大更新轮次数。如果为None则持续传播直到无新节点感染
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
 
         Returns:
             dict: 包含最终各状态节点集合的字典
@@ -105,21 +166,46 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
                 - 'recovered': 最终已康复的节点集合
                 - 'susceptible': 最终仍处于易感状态的节点集合
         """
+        self._propagate(update_counts, rng)
+        return self.recovered_nodes
+
+    def _diffusion_size(self, update_counts=None, rng: np.random.Generator = None) -> int:
+        """
+        执行完整的扩散过程，只返回最终康复的节点数。
+
+        蒙特卡洛模拟只需要结果规模，直接从状态标记计数，避免每轮构造节点集合。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+
+        Returns:
+            int: 最终康复的节点数
+        """
+        self._propagate(update_counts, rng)
+        return int(np.count_nonzero(self.recovered_mask))
+
+    def _propagate(self, update_counts, rng: np.random.Generator = None):
+        """
+        从初始状态开始反复调用update，直到满足停止条件。
+
+        Args:
+            update_counts (int, optional): 最大更新轮次数
+            rng (np.random.Generator, optional): 本次扩散使用的随机数生成器，为None时沿用模型当前的生成器
+        """
+        if rng is not None:
+            self._use_rng(rng)
         if update_counts is not None and update_counts <= 0:
             raise ValueError("update_counts must be a positive integer.")
 
-        count = 0
-        while True:
-            _ = self.update()
-            count += 1
-            # 当没有新的感染节点或者达到指定轮次时停止
-            if len(self.infected_nodes) == 0 or (update_counts and count >= update_counts):
+        for _ in range(update_counts or sys.maxsize):
+            self.update()
+            # 当没有感染节点时停止
+            if self._num_infected == 0:
                 break
 
-        return self.recovered_nodes
-
     def run_monte_carlo_diffusion(self, mc_rounds: int, update_counts: int = None, multi_process: bool = False,
-                                  processes: int = None, random_seed: int = None):
+                                  processes: int = None, random_seed: int = None, tol: float = None):
         """
         执行蒙特卡洛模拟扩散过程。
 
@@ -129,11 +215,12 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
             multi_process (bool): 是否启用多进程模式，默认为False
             processes (int, optional): 多进程模式下的进程数，为None时使用CPU核心数
             random_seed (int, optional): 随机种子，默认为None（每次结果不同）
+            tol (float, optional): 提前停止的相对标准误差阈值，默认为None（执行全部轮次）
 
         Returns:
             float: 所有模拟轮次的平均激活节点数
         """
-        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed)
+        return run_monte_carlo_diffusion(self, mc_rounds, update_counts, multi_process, processes, random_seed, tol)
 
 
     def reset(self, init_seeds=None):
@@ -146,10 +233,8 @@ class SusceptibleInfectedRecoveredModel(BaseDiffusionModel):
         Args:
             init_seeds (list, optional): 新的初始感染节点集合，若为None则使用原有种子集
         """
-        if init_seeds is None:
-            init_seeds = self.init_seeds
-        self.init_seeds = init_seeds
-        self.infected_nodes = set(init_seeds)
-        self.recovered_nodes = set()
+        if init_seeds is not None:
+            self.init_seeds = init_seeds
+        self._reset_infected()
         if self.record_states:
             self.states = []
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+from functools import cached_property
+from multiprocessing import shared_memory
+
+import numpy as np
 from networkx import Graph, DiGraph
 
+try:
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 from .._utils import set_edge_weight
 
+# 可放入共享内存的CSR数组字段，入边CSR按需在各进程中生成
+_CSR_FIELDS = ('indptr', 'indices', 'weights')
+
 
 class IMGraphPy:
     """
@@ -18,6 +31,16 @@ class IMGraphPy:
         number_of_nodes (int): 图中节点总数
         number_of_edges (int): 图中边总数
         edge_weight_type (str): 边权重类型
+        node_list (list): 节点列表，下标即为节点的连续编号
+        node_index (dict): 节点到连续编号的映射
+        indptr (np.ndarray): 出边CSR行指针，int32，长度为 number_of_nodes + 1
+        indices (np.ndarray): 出边CSR列索引（出邻居编号），int32
+        weights (np.ndarray): 与indices对齐的边权重，float32
+        in_indptr (np.ndarray): 入边CSR行指针，首次访问时生成，无向图与indptr相同
+        in_indices (np.ndarray): 入边CSR列索引（入邻居编号），首次访问时生成，无向图与indices相同
+        in_weights (np.ndarray): 与in_indices对齐的边权重，首次访问时生成，无向图与weights相同
+        constant_weight (float): 所有边权重相同时的权重值，否则为None
+        inv_in_degree (np.ndarray): 每条边权重都等于目标节点入度倒数时的按编号倒数数组(float32)，否则为None
     """
 
     def __init__(self, graph: Graph | DiGraph, edge_weight_type: str, constant_weight: float = None):
@@ -37,6 +60,266 @@ class IMGraphPy:
 
         set_edge_weight(self.nx_graph, edge_weight_type, constant_weight)
 
+        # 按图的方向一次性绑定入/出邻居与度视图，调用时不再判断方向
+        self.neighbors = self.out_neighbors = graph.neighbors
+        if self.direction:
+            self.in_neighbors = graph.predecessors
+            self._in_degree_view = graph.in_degree
+            self._out_degree_view = graph.out_degree
+        else:
+            self.in_neighbors = graph.neighbors
+            self._in_degree_view = self._out_degree_view = graph.degree
+
+        self.node_list = list(graph.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.node_list)}
+        self._build_csr()
+        self._detect_weight_pattern()
+
+    def _detect_weight_pattern(self):
+        """
+        识别可以不逐边读取权重的特殊情形，供传播内核选择特化版本。
+
+        CONSTANT 模式下所有边权重相同；有向图的 WC 模式下每条边的权重只取决于目标节点。
+        以CSR中的实际权重为准进行判断，不满足时对应属性为None，使用通用的逐边权重。
+        """
+        self.constant_weight = None
+        self.inv_in_degree = None
+        if self.weights.size == 0:
+            return
+        if self.edge_weight_type.upper() == 'CONSTANT' and np.all(self.weights == self.weights[0]):
+            self.constant_weight = float(self.weights[0])
+        elif self.edge_weight_type.upper() == 'WC':
+            # 直接在float32上求倒数，与CSR权重的精度一致
+            in_degree = self.in_degree_array.astype(np.float32)
+            inv_in_degree = np.zeros(self.number_of_nodes, dtype=np.float32)
+            np.reciprocal(in_degree, out=inv_in_degree, where=in_degree > 0)
+            if np.array_equal(self.weights, inv_in_degree[self.indices]):
+                self.inv_in_degree = inv_in_degree
+
+    def _build_csr(self):
+        """
+        构建出边CSR邻接结构。
+
+        indices[indptr[u]:indptr[u + 1]] 为编号u的出邻居编号，weights为对应的边权重。
+        无向图的每条边按两个方向各存一次。CSR在构造时根据当前边权重生成，
+        之后直接修改networkx图不会同步到这些数组。
+        """
+        n = self.number_of_nodes
+        index = self.node_index
+        src, dst, weight = [], [], []
+        for u, v, w in self.nx_graph.edges(data='weight'):
+            src.append(index[u])
+            dst.append(index[v])
+            weight.append(w)
+        if not self.direction:
+            # 反向补齐，自环只保留一份
+            mirror = [i for i in range(len(src)) if src[i] != dst[i]]
+            src, dst = src + [dst[i] for i in mirror], dst + [src[i] for i in mirror]
+            weight = weight + [weight[i] for i in mirror]
+
+        src = np.asarray(src, dtype=np.int32)
+        order = np.argsort(src, kind='stable')
+
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = np.asarray(dst, dtype=np.int32)[order]
+        self.weights = np.asarray(weight, dtype=np.float32)[order]
+
+
+    def to_shared(self):
+        """
+        将CSR数组复制到共享内存。
+
+        返回的描述信息只包含共享内存块的名称、形状和类型以及节点列表，可以低成本地传给
+        其他进程，由 from_shared 在该进程中重建只读的图对象，避免序列化整个networkx图。
+
+        Returns:
+            Tuple[dict, list]: 描述信息与共享内存块列表，调用方需在不再使用时对每个块
+            调用 close() 和 unlink()
+        """
+        arrays = {}
+        blocks = []
+        for field in _CSR_FIELDS:
+            array = getattr(self, field)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+            blocks.append(shm)
+            arrays[field] = (shm.name, array.shape, array.dtype.str)
+
+        meta = {
+            'arrays': arrays,
+            'direction': self.direction,
+            'number_of_nodes': self.number_of_nodes,
+            'number_of_edges': self.number_of_edges,
+            'edge_weight_type': self.edge_weight_type,
+            'constant_weight': self.constant_weight,
+            'inv_in_degree': self.inv_in_degree,
+            'node_list': self.node_list,
+        }
+        return meta, blocks
+
+    @classmethod
+    def from_shared(cls, meta: dict) -> IMGraphPy:
+        """
+        根据 to_shared 的描述信息，以共享内存中的CSR数组构造图对象。
+
+        构造出的对象不持有networkx图，只能用于基于CSR数组的传播计算。
+
+        Args:
+            meta (dict): to_shared 返回的描述信息
+
+        Returns:
+            IMGraphPy: CSR数组直接引用共享内存的图对象
+        """
+        graph = cls.__new__(cls)
+        graph.nx_graph = None
+        graph.direction = meta['direction']
+        graph.number_of_nodes = meta['number_of_nodes']
+        graph.number_of_edges = meta['number_of_edges']
+        graph.edge_weight_type = meta['edge_weight_type']
+        graph.constant_weight = meta['constant_weight']
+        graph.inv_in_degree = meta['inv_in_degree']
+        graph.node_list = meta['node_list']
+        graph.node_index = {node: i for i, node in enumerate(graph.node_list)}
+
+        # 保留共享内存块的引用，数组视图在其生命周期内有效
+        graph._shared_blocks = []
+        for field, (name, shape, dtype) in meta['arrays'].items():
+            shm = shared_memory.SharedMemory(name=name)
+            graph._shared_blocks.append(shm)
+            setattr(graph, field, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+        return graph
+
+    @cached_property
+    def _in_csr(self):
+        """
+        由出边CSR按目标节点重新分组得到的入边CSR，首次访问时创建并缓存。
+
+        in_indices[in_indptr[v]:in_indptr[v + 1]] 为编号v的入邻居编号，in_weights为对应的边权重。
+        无向图的出边即入边，直接复用出边数组。
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (in_indptr, in_indices, in_weights)
+        """
+        if not self.direction:
+            return self.indptr, self.indices, self.weights
+        n = self.number_of_nodes
+        src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+        in_order = np.argsort(self.indices, kind='stable')
+        in_indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.indices, minlength=n), out=in_indptr[1:])
+        return in_indptr, src[in_order], self.weights[in_order]
+
+    @property
+    def in_indptr(self) -> np.ndarray:
+        """入边CSR行指针，int32，长度为 number_of_nodes + 1。"""
+        return self._in_csr[0]
+
+    @property
+    def in_indices(self) -> np.ndarray:
+        """入边CSR列索引（入邻居编号），int32。"""
+        return self._in_csr[1]
+
+    @property
+    def in_weights(self) -> np.ndarray:
+        """与in_indices对齐的边权重，float32。"""
+        return self._in_csr[2]
+
+    @cached_property
+    def adjacency_matrix(self):
+        """
+        以出边CSR数组构造的带权邻接矩阵，首次访问时创建并缓存。
+
+        矩阵第u行第v列为边(u, v)的权重，行列下标为节点的连续编号，与CSR数组共享结构。
+
+        Returns:
+            scipy.sparse.csr_matrix: 形状为 (number_of_nodes, number_of_nodes) 的邻接矩阵
+
+        Raises:
+            ImportError: 如果 scipy 未安装。
+        """
+        if not SCIPY_AVAILABLE:
+            raise ImportError(
+                "scipy is required for adjacency_matrix. "
+                "Install it with: pip install scipy"
+            )
+        n = self.number_of_nodes
+        return sp.csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+
+    @cached_property
+    def id_to_orig(self) -> np.ndarray:
+        """
+        按连续编号排列的原始节点标识，首次访问时创建并缓存。
+
+        用于将编号数组整体映射回节点，如 id_to_orig[indices]。
+
+        Returns:
+            np.ndarray: 长度为 number_of_nodes 的object数组
+        """
+        # 逐个赋值，避免元组等可迭代的节点标识被numpy展开成多维数组
+        id_to_orig = np.empty(self.number_of_nodes, dtype=object)
+        for i, node in enumerate(self.node_list):
+            id_to_orig[i] = node
+        return id_to_orig
+
+    @cached_property
+    def degree_array(self) -> np.ndarray:
+        """
+        按节点连续编号排列的度数组，首次访问时由CSR数组计算并缓存。
+
+        Returns:
+            np.ndarray: 长度为 number_of_nodes 的int64数组，有向图为入度与出度之和
+        """
+        if self.direction:
+            return self.in_degree_array + self.out_degree_array
+        n = self.number_of_nodes
+        row_length = np.diff(self.indptr)
+        degree = row_length.astype(np.int64)
+        # 无向图的自环在CSR中只存一份，按networkx的约定计为2度
+        src = np.repeat(np.arange(n, dtype=np.int32), row_length)
+        degree += np.bincount(src[self.indices == src], minlength=n)
+        return degree
+
+    @cached_property
+    def in_degree_array(self) -> np.ndarray:
+        """
+        按节点连续编号排列的入度数组，首次访问时由CSR数组计算并缓存。
+
+        Returns:
+            np.ndarray: 长度为 number_of_nodes 的int64数组，无向图与degree_array相同
+        """
+        if not self.direction:
+            return self.degree_array
+        return np.bincount(self.indices, minlength=self.number_of_nodes).astype(np.int64)
+
+    @cached_property
+    def out_degree_array(self) -> np.ndarray:
+        """
+        按节点连续编号排列的出度数组，首次访问时由CSR数组计算并缓存。
+
+        Returns:
+            np.ndarray: 长度为 number_of_nodes 的int64数组，无向图与degree_array相同
+        """
+        if not self.direction:
+            return self.degree_array
+        return np.diff(self.indptr).astype(np.int64)
+
+    @cached_property
+    def infection_threshold(self) -> float:
+        """
+        基于度分布计算的感染阈值，首次访问时计算并缓存。
+
+        阈值为 <k> / (<k^2> - <k>) 上浮5%，SI/SIR模型未指定beta时使用。
+
+        Returns:
+            float: 感染阈值
+        """
+        deg = self.degree_array
+        k = int(deg.sum())
+        k2 = int((deg * deg).sum())
+        beta = k / (k2 - k)
+        return beta + 0.05 * beta
+
     @property
     def nodes(self):
         """
@@ -74,6 +357,7 @@ class IMGraphPy:
         获取指定节点的入邻居节点。
 
         对于有向图，返回前驱节点；对于无向图，返回所有邻居节点。
+        实例构造时会按图的方向直接绑定对应的networkx方法，此处定义仅作接口说明。
 
         Args:
             node: 节点标识符
@@ -103,7 +387,7 @@ class IMGraphPy:
         Returns:
             int: 图的入度视图
         """
-        return self.nx_graph.in_degree if self.direction else self.nx_graph.degree()
+        return self._in_degree_view
 
     @property
     def out_degree(self):
@@ -113,7 +397,7 @@ class IMGraphPy:
         Returns:
             int: 图的出度视图
         """
-        return self.nx_graph.out_degree if self.direction else self.nx_graph.degree()
+        return self._out_degree_view
 
     def degree(self):
         """
@@ -124,6 +408,17 @@ class IMGraphPy:
         """
         return self.nx_graph.degree()
 
+    def degrees(self) -> np.ndarray:
+        """
+        获取按节点连续编号排列的度数组。
+
+        与 degree() 不同，返回缓存的数组，重复调用不会再遍历邻接结构。
+
+        Returns:
+            np.ndarray: 度数组，同 degree_array
+        """
+        return self.degree_array
+
     def batch_out_degree(self, nodes):
         """
         批量获取指定节点的出度。
@@ -134,10 +429,8 @@ class IMGraphPy:
         Returns:
             list: 每个节点的出度列表
         """
-        if self.direction:
-            return [self.nx_graph.out_degree(node) for node in nodes]
-        else:
-            return [self.nx_graph.degree(node) for node in nodes]
+        degree = self._out_degree_view
+        return [degree[node] for node in nodes]
 
     def batch_in_degree(self, nodes):
         """
@@ -149,10 +442,8 @@ class IMGraphPy:
         Returns:
             list: 每个节点的入度列表
         """
-        if self.direction:
-            return [self.nx_graph.in_degree(node) for node in nodes]
-        else:
-            return [self.nx_graph.degree(node) for node in nodes]
+        degree = self._in_degree_view
+        return [degree[node] for node in nodes]
 
     def batch_degree(self, nodes):
         """
@@ -0,0 +1,196 @@
+"""
+扩散模型与蒙特卡洛模拟驱动的回归测试。
+
+不同实现（逐次/批量、单进程/进程池/线程池、Numba内核/NumPy回退）
+在固定随机种子下应给出一致（容差内）的平均影响力。
+
+Usage:
+    python -m pytest tests/test_diffusion_model.py
+"""
+import gc
+import importlib
+import warnings
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import pynetim
+from pynetim.diffusion_model import run_monte_carlo_diffusion_threaded
+from pynetim.graph import generate_er_graph, set_wc_weights
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from pynetim.py.graph import IMGraphPy
+    from pynetim.py.diffusion_model import (
+        IndependentCascadeModel,
+        LinearThresholdModel,
+        SusceptibleInfectedModel,
+        run_monte_carlo_diffusion,
+        run_monte_carlo_diffusion_batched,
+    )
+    from pynetim.py.diffusion_model import independent_cascade_model, linear_threshold_model
+    from pynetim.py.diffusion_model._cuda import _batched_ic
+    from pynetim.py.diffusion_model.run_monte_carlo_diffusion import _OnlineStats
+
+# 包的 __init__ 以同名函数遮蔽了子模块，按模块路径取得模块对象
+mc_module = importlib.import_module("pynetim.py.diffusion_model.run_monte_carlo_diffusion")
+SEEDS = [1, 2, 3]
+# 10000轮时单次估计的相对标准误差约为1.5%，两次独立估计之差取约4倍标准误差为容差
+SPREAD_REL_TOL = 0.08
+
+
+@pytest.fixture(scope="module")
+def wc_graph():
+    return IMGraphPy(nx.erdos_renyi_graph(300, 0.02, seed=1, directed=True), 'WC')
+
+
+@pytest.fixture(scope="module")
+def reference_spread(wc_graph):
+    """逐次模拟的IC平均影响力，作为其他实现的参照。"""
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    return model.run_monte_carlo_diffusion(10000, random_seed=0)
+
+
+def _fan_in_graph(weight: float) -> IMGraphPy:
+    # 0 -> 2 <- 1，两个种子各以 weight 影响节点2
+    return IMGraphPy(nx.DiGraph([(0, 2), (1, 2)]), 'CONSTANT', constant_weight=weight)
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def kernel_backend(request, monkeypatch):
+    """分别在Numba内核与NumPy回退实现下运行。"""
+    if request.param and not independent_cascade_model.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(independent_cascade_model, "NUMBA_AVAILABLE", request.param)
+    monkeypatch.setattr(linear_threshold_model, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def test_pool_matches_single_process(wc_graph, reference_spread):
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    pooled = model.run_monte_carlo_diffusion(10000, multi_process=True, processes=2, random_seed=0)
+    assert pooled == pytest.approx(reference_spread, rel=SPREAD_REL_TOL)
+
+
+def test_pool_follows_parameter_changes():
+    graph = IMGraphPy(nx.erdos_renyi_graph(200, 0.03, seed=1), 'WC')
+    model = SusceptibleInfectedModel(graph, SEEDS, beta=0.5)
+    before = model.run_monte_carlo_diffusion(400, 3, multi_process=True, processes=2, random_seed=3)
+    # 复用的进程池应使用修改后的beta，而不是创建进程池时的取值
+    model.beta = 0.01
+    single = model.run_monte_carlo_diffusion(400, 3, random_seed=3)
+    pooled = model.run_monte_carlo_diffusion(400, 3, multi_process=True, processes=2, random_seed=3)
+    assert pooled == pytest.approx(single, rel=0.2)
+    assert pooled < before / 10
+
+
+def test_pool_closes_when_model_is_collected(wc_graph):
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    model.run_monte_carlo_diffusion(100, multi_process=True, processes=2, random_seed=0)
+    assert mc_module._POOL is not None
+    del model
+    gc.collect()
+    assert mc_module._POOL is None
+    assert mc_module._POOL_SHARED == []
+
+
+def test_ic_fan_in_matches_closed_form(kernel_backend):
+    # IC中节点2的激活概率为 1 - (1 - p)^2
+    model = IndependentCascadeModel(_fan_in_graph(0.3), [0, 1])
+    spread = run_monte_carlo_diffusion(model, 20000, random_seed=7)
+    assert spread == pytest.approx(2 + 1 - 0.7 ** 2, abs=0.02)
+
+
+def test_lt_fan_in_matches_closed_form(kernel_backend):
+    # 阈值在每次模拟开始时重新抽取且服从U(0, 1)，节点2的激活概率为已激活入邻居的权重之和
+    model = LinearThresholdModel(_fan_in_graph(0.3), [0, 1])
+    spread = run_monte_carlo_diffusion(model, 20000, random_seed=7)
+    assert spread == pytest.approx(2 + 0.6, abs=0.02)
+
+
+def test_same_seed_is_reproducible(wc_graph):
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    first = model.run_monte_carlo_diffusion(500, random_seed=3)
+    second = model.run_monte_carlo_diffusion(500, random_seed=3)
+    assert first == second
+
+
+def test_batched_by_edges_matches_scalar(wc_graph, reference_spread, monkeypatch):
+    monkeypatch.setattr(mc_module, "SCIPY_AVAILABLE", False)
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    spread = run_monte_carlo_diffusion_batched(model, 10000, batch=256, random_seed=0)
+    assert spread == pytest.approx(reference_spread, rel=SPREAD_REL_TOL)
+
+
+@pytest.mark.skipif(not mc_module.SCIPY_AVAILABLE, reason="scipy is not installed")
+def test_batched_spmv_matches_scalar(wc_graph, reference_spread):
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    spread = run_monte_carlo_diffusion_batched(model, 10000, batch=256, random_seed=0)
+    assert spread == pytest.approx(reference_spread, rel=SPREAD_REL_TOL)
+
+
+@pytest.mark.skipif(not mc_module.SCIPY_AVAILABLE, reason="scipy is not installed")
+def test_batched_spmv_handles_certain_edges():
+    # 权重为1的边必然激活，SpMV路径不应对其取 log1p(-1)
+    graph = IMGraphPy(nx.DiGraph([(0, 1), (1, 2)]), 'CONSTANT', constant_weight=1.0)
+    model = IndependentCascadeModel(graph, [0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        spread = run_monte_carlo_diffusion_batched(model, 64, batch=16, random_seed=0)
+    assert spread == 3
+
+
+def test_tol_stops_early_near_full_estimate(wc_graph, reference_spread, monkeypatch):
+    rounds = []
+    push = _OnlineStats.push
+
+    def counting_push(self, x):
+        rounds.append(x)
+        push(self, x)
+
+    monkeypatch.setattr(_OnlineStats, "push", counting_push)
+    model = IndependentCascadeModel(wc_graph, SEEDS)
+    spread = model.run_monte_carlo_diffusion(100000, random_seed=0, tol=0.02)
+    assert len(rounds) < 100000
+    assert spread == pytest.approx(reference_spread, rel=0.1)
+
+
+def test_online_stats_merge_matches_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 50, size=1000)
+    left, right = _OnlineStats(), _OnlineStats()
+    for x in values[:300]:
+        left.push(x)
+    for x in values[300:]:
+        right.push(x)
+    left.merge(right)
+    assert left.n == len(values)
+    assert left.mean == pytest.approx(values.mean())
+    assert left.sem == pytest.approx(values.std(ddof=1) / np.sqrt(len(values)))
+
+
+def test_array_module_batched_ic_with_numpy(wc_graph, reference_spread):
+    # GPU路径的传播代码与数组模块无关，用numpy在CPU上运行同一实现
+    spread = _batched_ic(np, np.add.at, np.random.default_rng(0),
+                         wc_graph.indptr, wc_graph.indices, wc_graph.weights,
+                         wc_graph.number_of_nodes, np.asarray(SEEDS), 10000, 256, None)
+    assert spread == pytest.approx(reference_spread, rel=SPREAD_REL_TOL)
+
+
+def test_threaded_matches_single_thread():
+    graph = generate_er_graph(n=300, p=0.02, random_seed=1)
+    set_wc_weights(graph)
+    model = pynetim.IndependentCascadeModel(graph, {1, 2, 3})
+    single = model.run_monte_carlo_diffusion(10000, random_seed=0)
+    threaded = run_monte_carlo_diffusion_threaded(model, 10000, random_seed=0, num_threads=2)
+    assert threaded == pytest.approx(single, rel=SPREAD_REL_TOL)
+    assert run_monte_carlo_diffusion_threaded(model, 1000, random_seed=5, num_threads=2) == \
+        run_monte_carlo_diffusion_threaded(model, 1000, random_seed=5, num_threads=2)
+
+
+@pytest.mark.parametrize("kwargs", [{"mc_rounds": 0}, {"mc_rounds": 10, "num_threads": 0}])
+def test_threaded_rejects_invalid_arguments(kwargs):
+    model = pynetim.IndependentCascadeModel(pynetim.IMGraph([(0, 1)], weights=0.5), {0})
+    with pytest.raises(ValueError):
+        run_monte_carlo_diffusion_threaded(model, **kwargs)
@@ -0,0 +1,108 @@
+"""
+C++ IMGraph 批量边权重接口的回归测试。
+
+Usage:
+    python -m pytest tests/test_graph_weights.py
+"""
+import numpy as np
+import pytest
+
+from pynetim import IMGraph
+from pynetim.graph import (
+    generate_er_graph,
+    set_const_weights,
+    set_tv_weights,
+    set_uniform_weights,
+    set_wc_weights,
+)
+
+
+def _weights_by_edge(graph: IMGraph) -> dict:
+    us, vs, ws = graph.get_edge_arrays()
+    return dict(zip(zip(us.tolist(), vs.tolist()), ws.tolist()))
+
+
+@pytest.fixture
+def triangle():
+    return IMGraph([(0, 1), (1, 2), (2, 0), (0, 2)], weights=0.5)
+
+
+def test_get_edge_arrays_matches_edges(triangle):
+    us, vs, ws = triangle.get_edge_arrays()
+    assert us.dtype == np.int32 and vs.dtype == np.int32 and ws.dtype == np.float64
+    assert _weights_by_edge(triangle) == {(0, 1): 0.5, (1, 2): 0.5, (2, 0): 0.5, (0, 2): 0.5}
+
+
+def test_update_edge_weights_round_trip(triangle):
+    us, vs, ws = triangle.get_edge_arrays()
+    new = np.linspace(0.1, 0.4, len(us))
+    triangle.update_edge_weights(us, vs, new)
+
+    assert triangle.num_edges == 4
+    assert _weights_by_edge(triangle) == dict(zip(zip(us.tolist(), vs.tolist()), new.tolist()))
+    for u, v, w in zip(us.tolist(), vs.tolist(), new.tolist()):
+        assert triangle.get_edge_weight(u, v) == w
+    # 邻接表中的权重与 edges 保持一致
+    adjacency = {(u, edge.to): edge.weight for u, row in enumerate(triangle.get_adj_list()) for edge in row}
+    assert adjacency == _weights_by_edge(triangle)
+
+
+def test_update_edge_weights_accepts_wider_dtypes(triangle):
+    us, vs, _ = triangle.get_edge_arrays()
+    triangle.update_edge_weights(us.astype(np.int64), vs.astype(np.uint16), np.full(len(us), 0.25, np.float32))
+    assert set(_weights_by_edge(triangle).values()) == {0.25}
+
+
+def test_update_edge_weights_missing_edge_changes_nothing(triangle):
+    before = _weights_by_edge(triangle)
+    with pytest.raises(RuntimeError):
+        triangle.update_edge_weights(np.array([0, 1]), np.array([1, 0]), np.array([0.9, 0.9]))
+    assert _weights_by_edge(triangle) == before
+    assert triangle.num_edges == 4
+
+
+@pytest.mark.parametrize("method", ["update_edge_weights", "add_edges_with_weights"])
+def test_bulk_apis_reject_truncated_node_ids(triangle, method):
+    with pytest.raises(IndexError):
+        getattr(triangle, method)(np.array([0]), np.array([2 ** 32 + 1]), np.array([0.1]))
+
+
+@pytest.mark.parametrize("us, vs, ws, error", [
+    (np.array([0.0]), np.array([1]), np.array([0.1]), TypeError),
+    (np.array([0]), np.array([1]), np.array([0.1 + 0j]), TypeError),
+    (np.array([0]), np.array([1, 2]), np.array([0.1]), ValueError),
+    (np.array([[0]]), np.array([1]), np.array([0.1]), ValueError),
+])
+def test_update_edge_weights_validates_arrays(triangle, us, vs, ws, error):
+    with pytest.raises(error):
+        triangle.update_edge_weights(us, vs, ws)
+
+
+def test_add_edges_with_weights_inserts_and_updates(triangle):
+    triangle.add_edges_with_weights(np.array([1, 0]), np.array([0, 1]), np.array([0.3, 0.7]))
+    weights = _weights_by_edge(triangle)
+    assert triangle.num_edges == 5
+    assert weights[(1, 0)] == 0.3 and weights[(0, 1)] == 0.7
+
+
+def test_weight_setters_keep_edge_set():
+    graph = generate_er_graph(n=200, p=0.05, random_seed=1)
+    edges = set(_weights_by_edge(graph))
+    num_edges = graph.num_edges
+
+    set_const_weights(graph, 0.2)
+    assert set(_weights_by_edge(graph).values()) == {0.2}
+
+    set_tv_weights(graph, [0.001, 0.01, 0.1])
+    assert set(_weights_by_edge(graph).values()) <= {0.001, 0.01, 0.1}
+
+    set_uniform_weights(graph, 0.01, 0.5)
+    assert all(0.01 <= w < 0.5 for w in _weights_by_edge(graph).values())
+
+    set_wc_weights(graph)
+    in_degrees = np.asarray(graph.get_all_in_degrees(), dtype=np.float64)
+    us, vs, ws = graph.get_edge_arrays()
+    np.testing.assert_allclose(ws, 1.0 / in_degrees[vs])
+
+    assert set(_weights_by_edge(graph)) == edges
+    assert graph.num_edges == num_edges
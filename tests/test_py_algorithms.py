@@ -0,0 +1,118 @@
+"""
+pynetim.py 影响力最大化算法的回归测试。
+
+Usage:
+    python -m pytest tests/test_py_algorithms.py
+"""
+import warnings
+
+import networkx as nx
+import numpy as np
+import pytest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from pynetim.py.graph import IMGraphPy
+    from pynetim.py.algorithms import (
+        BaseRISAlgorithm,
+        CELFAlgorithm,
+        DegreeDiscountAlgorithm,
+        GreedyAlgorithm,
+        IMMAlgorithm,
+    )
+    from pynetim.py.algorithms import RIS_algorithm, heuristic_algorithm
+    from pynetim.py.diffusion_model import IndependentCascadeModel
+
+
+@pytest.fixture(scope="module")
+def star_graph():
+    # 中心节点0指向10个叶子节点，边必然激活
+    return IMGraphPy(nx.star_graph(10, create_using=nx.DiGraph), 'CONSTANT', constant_weight=1.0)
+
+
+@pytest.fixture(scope="module")
+def small_graph():
+    return IMGraphPy(nx.erdos_renyi_graph(40, 0.08, seed=3, directed=True), 'WC')
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "python"])
+def ris_backend(request, monkeypatch):
+    """分别在Numba内核与纯Python实现下运行RIS节点选择。"""
+    if request.param and not RIS_algorithm.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(RIS_algorithm, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def test_ris_node_selection_counts_each_rr_set_once(ris_backend):
+    graph = nx.DiGraph([(0, 1)])
+    graph.add_nodes_from(range(5))
+    ris = BaseRISAlgorithm(IMGraphPy(graph, 'WC'), 'IC', seed=0)
+    # 节点0覆盖前三个RR集合；选中0后节点1还剩两个、节点4还剩一个未覆盖的RR集合
+    rr_sets = [[0, 1], [0, 2], [0, 3], [1], [1], [4]]
+    rr_data = np.asarray([v for rr in rr_sets for v in rr], dtype=np.int32)
+    rr_ptr = np.cumsum([0] + [len(rr) for rr in rr_sets]).astype(np.int64)
+
+    seeds, coverage = ris._node_selection(rr_data, rr_ptr, 2)
+    assert seeds == {0, 1}
+    assert coverage == pytest.approx(5 / 6)
+
+
+def test_celf_picks_star_center(star_graph):
+    seeds = CELFAlgorithm(star_graph, IndependentCascadeModel).run(1, 10, show_progress=False, random_seed=0)
+    assert seeds == [0]
+
+
+def test_greedy_rejects_k_larger_than_graph(star_graph):
+    with pytest.raises(ValueError):
+        GreedyAlgorithm(star_graph, IndependentCascadeModel).run(12, 1, show_progress=False)
+
+
+def test_greedy_selects_every_node_when_k_equals_n():
+    # 无边图中所有候选的增益都为0，仍应逐个选完全部节点
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(4))
+    im_graph = IMGraphPy(graph, 'WC')
+    seeds = GreedyAlgorithm(im_graph, IndependentCascadeModel).run(4, 5, show_progress=False, random_seed=0)
+    assert sorted(seeds) == [0, 1, 2, 3]
+
+
+def test_greedy_picks_star_center(star_graph):
+    seeds = GreedyAlgorithm(star_graph, IndependentCascadeModel).run(1, 10, show_progress=False, random_seed=0)
+    assert seeds == [0]
+
+
+def test_greedy_pool_matches_single_process(small_graph):
+    greedy = GreedyAlgorithm(small_graph, IndependentCascadeModel)
+    single = greedy.run(2, 20, show_progress=False, random_seed=1)
+    pooled = greedy.run(2, 20, multi_process=True, processes=2, show_progress=False, random_seed=1)
+    assert sorted(single) == sorted(pooled)
+
+
+def test_degree_discount_picks_star_center(star_graph):
+    assert DegreeDiscountAlgorithm(star_graph).run(1)[0] == 0
+
+
+@pytest.mark.parametrize("directed", [True, False], ids=["directed", "undirected"])
+def test_degree_discount_kernel_matches_python(directed, monkeypatch):
+    graph = nx.gnm_random_graph(100, 400, seed=2, directed=directed)
+    graph.add_edge(5, 5)
+    im_graph = IMGraphPy(graph, 'WC')
+    if not heuristic_algorithm.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    kernel = DegreeDiscountAlgorithm(im_graph).run(10)
+    monkeypatch.setattr(heuristic_algorithm, "NUMBA_AVAILABLE", False)
+    assert DegreeDiscountAlgorithm(im_graph).run(10) == kernel
+
+
+def test_imm_requires_two_nodes():
+    graph = nx.DiGraph()
+    graph.add_node(0)
+    with pytest.raises(ValueError):
+        IMMAlgorithm(IMGraphPy(graph, 'WC'), 'IC', seed=0)
+
+
+def test_imm_picks_star_center_and_is_reproducible(star_graph):
+    first = IMMAlgorithm(star_graph, 'IC', seed=1).run(1)
+    second = IMMAlgorithm(star_graph, 'IC', seed=1).run(1)
+    assert first == second == [0]